@@ -1,11 +1,14 @@
 from json import load
 import streamlit as st
 import os
-from src.utils.output_handler import capture_output
-from src.utils.md2pdf import st_md2pdf
-from src.utils.json2pdf import json_to_pdf
-from resume_crew.main import run
+import time
+import uuid
+from src.utils.job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED, CANCELLED
+from resume_crew.instrumentation import load_metrics, summarize_metrics
 from resume_crew.models import CompanyResearch, JobRequirements, ResumeOptimization
+from resume_crew.outputs import new_run_id, output_path
+
+STATUS_ICONS = {QUEUED: "⏳", RUNNING: "🤖", DONE: "✅", FAILED: "❌", CANCELLED: "🚫"}
 
 def validate_non_empty(st_field, field_name):
     if not st_field:
@@ -19,6 +22,83 @@ def validate_url(st_field, field_name):
         return True, ""
     return False, f"Please enter a valid URL in {field_name}"
 
+@st.cache_resource
+def get_job_queue():
+    """Job queue shared by every session of this Streamlit server"""
+    return JobQueue(max_workers=int(os.environ.get("RESUME_CREW_WORKERS", 2)))
+
+def run_crew_job(job, job_url, company_name, resume_file, resume_data, llm_model):
+    # Imported on first use: loading the crew stack takes seconds and is not needed to render the page.
+    from resume_crew.main import run
+    return run(job_url=job_url, company_name=company_name, resume_file=resume_file, resume_data=resume_data,
+               llm_model=llm_model, run_id=job.id, step_callback=job.check_cancelled,
+               stream_sink=job.attach_stream)
+
+MODEL_OUTPUTS = {
+    "company_research.json": CompanyResearch,
+    "job_analysis.json": JobRequirements,
+    "resume_optimization.json": ResumeOptimization,
+}
+
+@st.cache_resource(max_entries=int(os.environ.get("RENDER_CACHE_ENTRIES", 64)), show_spinner=False)
+def render_output(path, mtime_ns, size):
+    """
+    Validated model (None for markdown files) and download bytes of an output file.
+
+    Keyed by path, mtime and size so a rewritten file is rendered again; shared
+    by all sessions and bounded to RENDER_CACHE_ENTRIES files.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    model_cls = MODEL_OUTPUTS.get(os.path.basename(path))
+    if model_cls is None:
+        return None, data
+    model = model_cls.model_validate_json(data)
+    return model, model.to_markdown().encode("utf-8")
+
+def rendered_output(file_name, run_id):
+    """Cached (model, bytes) of a run output, or None while the file does not exist"""
+    path = output_path(file_name, run_id)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return render_output(path, stat.st_mtime_ns, stat.st_size)
+
+@st.fragment(run_every=1)
+def job_status_panel(job_id):
+    """Poll the background job and show its queue position, live output or result"""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        return
+    if job.status == QUEUED:
+        st.info(f"⏳ Waiting in queue, position {queue.position(job_id)}")
+    elif job.status == RUNNING:
+        with st.status("🤖 Analyzing...", expanded=True):
+            live = job.stream.current if job.stream else None
+            if live is not None:
+                st.caption(f"✍️ {live.name}")
+                partial = live.partial()
+                if partial is not None:
+                    st.json(partial.model_dump(exclude_unset=True))
+                elif live.answer:
+                    st.markdown(live.answer)
+            process_container = st.container(height=500, border=True)
+            process_container.text("\n".join(job.log))
+    elif job.status == DONE:
+        st.success("✅ Analysis completed!")
+        if st.session_state.get("rendered_run_id") != job_id:
+            # Rerun the whole app once so the download section picks up the outputs.
+            st.session_state.rendered_run_id = job_id
+            st.rerun()
+    elif job.status == FAILED:
+        st.error(f"❌ An error occurred: {job.error}")
+    elif job.status == CANCELLED:
+        st.warning("Run cancelled")
+    if not job.finished and st.button("Cancel run", key=f"cancel_{job_id}"):
+        queue.cancel(job_id)
+
 # Initialize session state
 if 'form_submitted' not in st.session_state:
     st.session_state.form_submitted = False
@@ -64,6 +144,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Identify the browser across page refreshes, and reattach to its last run
+if 'user' not in st.query_params:
+    st.query_params["user"] = uuid.uuid4().hex
+if 'run_id' not in st.session_state and 'run_id' in st.query_params:
+    st.session_state.run_id = st.query_params["run_id"]
+
 # Logo
 st.logo(
     "https://cdn.prod.website-files.com/66cf2bfc3ed15b02da0ca770/66d07240057721394308addd_Logo%20(1).svg",
@@ -79,6 +165,7 @@ with col2:
 with st.sidebar: 
     st.divider()
     llm_model = st.selectbox("Select Model:", ["gpt-4o-mini","o1"])
+    show_metrics = st.checkbox("Show run metrics", value=False, help="Latency, tokens and cost per task")
 
 # Create two columns for the input section
 input_col1, input_col2, input_col3 = st.columns([1, 3, 1])
@@ -129,35 +216,25 @@ with col2:
             if not validation_messages:
                 st.success("Form submitted successfully!")
                 st.session_state.form_submitted = True
+                job = get_job_queue().submit(
+                    st.query_params["user"], run_crew_job, job_id=new_run_id(),
+                    job_url=job_url, company_name=company_name,
+                    resume_file=resume_file.name, resume_data=resume_file.getbuffer(), llm_model=llm_model
+                )
+                st.session_state.run_id = job.id
+                st.query_params["run_id"] = job.id
             else:
                 st.error("Please fix the following validation errors:")
                 for message in validation_messages:
                     st.error(f"• {message}")
-        submitted = False
-        if submitted:            
-            path = os.path.join("input", resume_file.name)
-            with open(path, "wb") as f:
-                f.write(resume_file.getvalue())
-
-            with st.status("🤖 Analyzing...", expanded=True) as status:
-                try:
-                    # Create persistent container for process output with fixed height.
-                    process_container = st.container(height=500, border=True)
-                    output_container = process_container.container()
-                    
-                    # Single output capture context.
-                    with capture_output(output_container):
-                        
-                        result = run(job_url=job_url, company_name=company_name, 
-                                    resume_file=resume_file.name, llm_model=llm_model)
-                        status.update(label="✅ Analysis completed!", state="complete", expanded=False)
-                except Exception as e:
-                    status.update(label="❌ Error occurred", state="error")
-                    st.error(f"An error occurred: {str(e)}")
-                    st.stop()
-    
-    if os.path.isfile("output/company_research.md"):
-        md_content = CompanyResearch.json_to_md()
+
+    if st.session_state.get('run_id'):
+        job_status_panel(st.session_state.run_id)
+
+    run_id = st.session_state.get('run_id')
+    rendered = rendered_output("company_research.json", run_id) if run_id else None
+    if rendered:
+        _, md_content = rendered
 
         st.divider()
         download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
@@ -167,14 +244,15 @@ with col2:
             # Download as Markdown
             st.download_button(
                 label="Download MarkDown Company Report",
-                data=md_content.encode('utf-8'),
-                file_name="output/company_research.md",
+                data=md_content,
+                file_name="company_research.md",
                 mime="application/octet-stream",
                 help="Download the company research report in Markdown format"
             )
     
-    if os.path.isfile("output/job_analysis.md"):
-        md_content = JobRequirements.json_to_md()
+    rendered = rendered_output("job_analysis.json", run_id) if run_id else None
+    if rendered:
+        _, md_content = rendered
         st.divider()
         download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
         with download_col2:
@@ -183,13 +261,14 @@ with col2:
             # Download as Markdown
             st.download_button(
                 label="Download Job Analysis Report",
-                data=md_content.encode('utf-8'),
-                file_name="output/job_analysis.md",
+                data=md_content,
+                file_name="job_analysis.md",
                 mime="application/octet-stream",
                 help="Download the job analyis report"
             )
-    if os.path.isfile("output/resume_optimization.md"):
-        md_content = ResumeOptimization.json_to_md()
+    rendered = rendered_output("resume_optimization.json", run_id) if run_id else None
+    if rendered:
+        _, md_content = rendered
         st.divider()
         download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
         with download_col2:
@@ -198,13 +277,15 @@ with col2:
             # Download as Markdown
             st.download_button(
                 label="Download Resume Optimization Report",
-                data=md_content.encode('utf-8'),
-                file_name="output/resume_optimization.md",
+                data=md_content,
+                file_name="resume_optimization.md",
                 mime="application/octet-stream",
                 help="Download the reume optimization report"
             )
 
-    if os.path.isfile("output/resume_optimization.md"):
+    rendered = rendered_output("final_report.md", run_id) if run_id else None
+    if rendered:
+        _, md_content = rendered
         st.divider()
         download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
         with download_col2:
@@ -213,12 +294,14 @@ with col2:
             # Download as Markdown
             st.download_button(
                 label="Download Final Report",
-                data="output/final_report.md",
-                file_name="output/final_report.md",
+                data=md_content,
+                file_name="final_report.md",
                 mime="application/octet-stream",
                 help="Download final report"
             )
-    if os.path.isfile("output/optimized_resume.md"):
+    rendered = rendered_output("optimized_resume.md", run_id) if run_id else None
+    if rendered:
+        _, md_content = rendered
         st.divider()
         download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
         with download_col2:
@@ -227,12 +310,37 @@ with col2:
             # Download as Markdown
             st.download_button(
                 label="Download Final Report",
-                data="output/optimized_resume.md",
-                file_name="output/optimized_resume.md",
+                data=md_content,
+                file_name="optimized_resume.md",
                 mime="application/octet-stream",
                 help="Download Optimized Resume report"
             )
 
+    if show_metrics and run_id and os.path.isfile(output_path("metrics.jsonl", run_id)):
+        st.divider()
+        st.markdown("### ⏱️ Run Metrics")
+        records = load_metrics(output_path("metrics.jsonl", run_id))
+        st.dataframe(summarize_metrics(records), use_container_width=True)
+        with st.expander("LLM and tool calls"):
+            st.dataframe([r for r in records if r["kind"] != "task"], use_container_width=True)
+
+# This browser's runs (the user id is kept in the URL), newest first. Drawn
+# last so that a run submitted in this script run is listed too.
+with st.sidebar:
+    user_jobs = sorted(get_job_queue().jobs_for(st.query_params["user"]), key=lambda job: job.submitted_at,
+                       reverse=True)
+    if user_jobs:
+        st.divider()
+        st.markdown("### Your runs")
+        for job in user_jobs:
+            submitted = time.strftime("%H:%M", time.localtime(job.submitted_at))
+            label = f"{STATUS_ICONS[job.status]} {job.kwargs.get('company_name') or job.id} ({submitted})"
+            if st.button(label, key=f"attach_{job.id}", help=job.kwargs.get('job_url'),
+                         disabled=job.id == st.session_state.get('run_id'), use_container_width=True):
+                st.session_state.run_id = job.id
+                st.query_params["run_id"] = job.id
+                st.rerun()
+
 # Add footer
 st.divider()
 footer_col1, footer_col2, footer_col3 = st.columns([1, 2, 1])
@@ -0,0 +1,72 @@
+"""
+Job description extraction on the saved job pages, with token savings.
+
+Runs ``extract_job_posting`` on every page in ``benchmarks/fixtures/pages``
+that has an entry in ``expected.json``, and reports the layout used, the
+tokens of the whole page text and of the extracted description, and the
+extraction time. Exits non-zero when a page is read with another layout
+than expected, loses a phrase of the description or keeps a piece of
+boilerplate (navigation, cookie banners, application forms, related jobs).
+
+    python benchmarks/bench_job_extract.py
+    python benchmarks/bench_job_extract.py --show
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+PAGES_DIR = os.path.join(BENCH_DIR, 'fixtures', 'pages')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', default=PAGES_DIR, help='Directory with index.json and expected.json')
+    parser.add_argument('--repeat', type=int, default=20, help='Extractions per page for the timing')
+    parser.add_argument('--show', action='store_true', help='Print the extracted text')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+    from resume_crew.job_extract import extract_job_posting
+
+    with open(os.path.join(args.pages, 'index.json'), 'r') as f:
+        index = json.load(f)
+    with open(os.path.join(args.pages, 'expected.json'), 'r') as f:
+        expected = json.load(f)
+
+    failures = []
+    total_before = total_after = 0
+    print(f"{'page':<24} {'layout':<10} {'before':>7} {'after':>7} {'saved':>6} {'ms':>6}")
+    for url, expectation in expected.items():
+        with open(os.path.join(args.pages, index[url]), 'r') as f:
+            html = f.read()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            posting = extract_job_posting(html, url)
+        ms = (time.perf_counter() - start) * 1000 / args.repeat
+        total_before += posting.tokens_before
+        total_after += posting.tokens_after
+        saved = 1 - posting.tokens_after / posting.tokens_before
+        print(f"{index[url]:<24} {posting.layout:<10} {posting.tokens_before:>7} {posting.tokens_after:>7} "
+              f"{saved:>6.0%} {ms:>6.1f}")
+        if args.show:
+            print(posting.text, end='\n\n')
+
+        if posting.layout != expectation['layout']:
+            failures.append(f"{index[url]}: read as {posting.layout}, expected {expectation['layout']}")
+        for phrase in expectation.get('contains', []):
+            if phrase not in posting.text:
+                failures.append(f"{index[url]}: missing {phrase!r}")
+        for phrase in expectation.get('excludes', []):
+            if phrase in posting.text:
+                failures.append(f"{index[url]}: kept {phrase!r}")
+    print(f"{'total':<24} {'':<10} {total_before:>7} {total_after:>7} {1 - total_after / total_before:>6.0%}")
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
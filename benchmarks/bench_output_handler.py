@@ -0,0 +1,70 @@
+"""
+Per-write cost of StreamlitProcessOutput over a long verbose run.
+
+Writes 100k unique log lines (with ANSI codes, like crewAI's verbose output)
+into the handler, flushing after each one as rich's Console does, and
+reports the mean cost per write for every block of 10k lines. The cost must
+stay flat and renders must stay within the handler's ``min_interval``
+throttle: the script exits non-zero when the last block is more than 3x
+slower than the first or when there are more renders than intervals.
+
+    python benchmarks/bench_output_handler.py [--lines 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.output_handler import StreamlitProcessOutput
+
+
+class CountingContainer:
+    def __init__(self):
+        self.renders = 0
+        self.rendered_chars = 0
+
+    def text(self, body):
+        self.renders += 1
+        self.rendered_chars += len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=100_000)
+    parser.add_argument('--block', type=int, default=10_000)
+    args = parser.parse_args()
+
+    container = CountingContainer()
+    handler = StreamlitProcessOutput(container)
+    block_costs = []
+    start = began = time.perf_counter()
+    for i in range(args.lines):
+        handler.write(f"\x1b[1m\x1b[95m# Agent:\x1b[00m step {i}: thinking about the resume\n")
+        handler.flush()
+        if (i + 1) % args.block == 0:
+            now = time.perf_counter()
+            block_costs.append((now - start) / args.block * 1e6)
+            start = now
+    elapsed = time.perf_counter() - began
+    if handler.dirty:  # what capture_output does on exit
+        handler.render()
+
+    for n, cost in enumerate(block_costs, 1):
+        print(f"lines {(n - 1) * args.block:>7}-{n * args.block:<7} {cost:8.2f} us/write")
+    print(f"renders: {container.renders}, retained lines: {len(handler.lines)}")
+
+    ratio = block_costs[-1] / block_costs[0]
+    print(f"last/first block cost ratio: {ratio:.2f}")
+    failures = []
+    if ratio > 3:
+        failures.append("per-write cost grows with output length")
+    max_renders = int(elapsed / handler.min_interval) + 2
+    if container.renders > max_renders:
+        failures.append(f"{container.renders} renders in {elapsed:.2f}s, the throttle allows {max_renders}")
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
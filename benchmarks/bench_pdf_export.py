@@ -0,0 +1,65 @@
+"""
+Pages per second of the PDF export.
+
+Copies the sample outputs in ``output/`` into ``--runs`` run directories and
+exports them with ``export_runs`` for every worker count in ``--workers``.
+``--per-file`` adds the old approach for comparison: a new document, with
+its fonts loaded again, for every artifact.
+
+    python benchmarks/bench_pdf_export.py --runs 16 --workers 1 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=16)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--per-file', action='store_true', help='Also time one document per artifact')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ['RESUME_CREW_OUTPUT_DIR'] = workdir
+    sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+    from resume_crew.outputs import output_path
+    from resume_crew.pdf_export import ARTIFACTS, PdfRenderer, artifact_markdown, export_runs
+
+    run_ids = [f'bench-{i}' for i in range(args.runs)]
+    for run_id in run_ids:
+        os.makedirs(os.path.dirname(output_path('x', run_id)), exist_ok=True)
+        for file_name, _ in ARTIFACTS:
+            shutil.copy(os.path.join(REPO_ROOT, 'output', file_name), output_path(file_name, run_id))
+
+    try:
+        if args.per_file:
+            start = time.perf_counter()
+            pages = 0
+            for run_id in run_ids:
+                for file_name, title in ARTIFACTS:
+                    renderer = PdfRenderer()
+                    renderer.add_markdown(title, artifact_markdown(output_path(file_name, run_id)))
+                    renderer.output(output_path(file_name + '.pdf', run_id))
+                    pages += renderer.pages
+            elapsed = time.perf_counter() - start
+            print(f"per-file    workers 1   {pages / elapsed:7.1f} pages/s  {args.runs / elapsed:6.2f} runs/s")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = export_runs(run_ids, workers=workers)
+            elapsed = time.perf_counter() - start
+            pages = sum(r['pages'] for r in results)
+            print(f"export_runs workers {workers:<3} {pages / elapsed:7.1f} pages/s  {args.runs / elapsed:6.2f} runs/s")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
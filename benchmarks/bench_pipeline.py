@@ -0,0 +1,178 @@
+"""
+Offline end-to-end benchmark of the ResumeCrew pipeline.
+
+Runs the full crew against the local fake LLM server, with the scrape and
+search tools served from benchmarks/fixtures, so only the pipeline's own
+overhead (orchestration, pydantic validation, file writes, rendering) plus
+the configured stub latency is measured. Each concurrency level runs in a
+fresh subprocess so its peak RSS is reported separately, together with the
+number of connections it opened to the stub (``--no-pool`` disables the
+shared LLM clients for comparison) and the LLM requests it made.
+``--malformed`` makes the stub answer with almost-valid JSON, so the
+requests saved by the local output repair show up against ``--no-repair``.
+Latencies and runs/minute count successful runs only; with ``--baseline``
+any failed run fails the check.
+
+    python benchmarks/bench_pipeline.py --levels 1 8 32 --latency 0.05
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+JOB_URL = 'https://jobs.example.com/associate-15178'
+COMPANY_NAME = 'Benchmark Consulting'
+
+
+def worker(concurrency: int, runs: int, result_file: str) -> None:
+    """Run ``runs`` crews with ``concurrency`` threads and write the stats as JSON."""
+    from resume_crew.batch import percentile
+    from resume_crew.crew import ResumeCrew
+    from resume_crew.outputs import new_run_id
+
+    md_file_path = os.path.join(FIXTURES_DIR, 'resume.md')
+    inputs = {'job_url': JOB_URL, 'company_name': COMPANY_NAME}
+
+    failed = []
+
+    def run_one(_):
+        start = time.perf_counter()
+        crew = ResumeCrew('resume.pdf', 'gpt-4o-mini', md_file_path=md_file_path, run_id=new_run_id()).crew()
+        try:
+            crew.kickoff(inputs=inputs)
+        except Exception as e:
+            failed.append(f'{type(e).__name__}: {e}'[:200])
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Failed runs stop early; their latency would only flatter the percentiles.
+        latencies = [latency for latency in executor.map(run_one, range(runs)) if latency is not None]
+    wall_time = time.perf_counter() - start
+
+    with open(result_file, 'w') as f:
+        json.dump({
+            'concurrency': concurrency,
+            'runs': runs,
+            'wall_time': round(wall_time, 3),
+            'runs_per_minute': round(len(latencies) / wall_time * 60, 2),
+            'p50_latency': round(percentile(latencies, 50), 3),
+            'p95_latency': round(percentile(latencies, 95), 3),
+            'max_latency': round(max(latencies, default=0.0), 3),
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'failed_runs': len(failed),
+            'errors': failed[:5],
+        }, f)
+
+
+def run_level(concurrency: int, runs: int, server, workdir: str, pool: bool = True, repair: bool = True) -> dict:
+    result_file = os.path.join(workdir, f'result-{concurrency}.json')
+    server_url = server.url
+    connections = server.connections
+    requests = server.requests
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join([os.path.abspath(os.path.join(REPO_ROOT, 'src')), os.environ.get('PYTHONPATH', '')]),
+        'OPENAI_API_BASE': server_url,
+        'OPENAI_BASE_URL': server_url,
+        'OPENAI_API_KEY': 'stub',
+        'SERPER_API_KEY': 'stub',
+        'SCRAPE_OFFLINE': '1',
+        'SCRAPE_FIXTURES_DIR': os.path.join(FIXTURES_DIR, 'pages'),
+        'SEARCH_FIXTURES_FILE': os.path.join(FIXTURES_DIR, 'search.json'),
+        'RESUME_CREW_CACHE_DIR': os.path.join(workdir, f'cache-{concurrency}'),
+        # crewAI only accepts relative output paths, so the worker runs inside workdir.
+        'RESUME_CREW_OUTPUT_DIR': f'output-{concurrency}',
+        'RESUME_CREW_LLM_CACHE': '0',
+        'RESUME_CREW_CHECKPOINTS': '0',
+        'CREWAI_DISABLE_TELEMETRY': 'true',
+        'OTEL_SDK_DISABLED': 'true',
+        'RESUME_CREW_LLM_POOL': '1' if pool else '0',
+        'RESUME_CREW_REPAIR': '1' if repair else '0',
+    }
+    subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', str(concurrency), '--runs', str(runs),
+         '--result-file', result_file],
+        # No stdin: crewAI's first-run trace prompt would otherwise block on it.
+        env=env, cwd=workdir, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL
+    )
+    with open(result_file, 'r') as f:
+        result = json.load(f)
+    result['connections'] = server.connections - connections
+    result['llm_requests'] = server.requests - requests
+    return result
+
+
+def check_regressions(results: list, baseline_file: str, tolerance: float) -> list:
+    with open(baseline_file, 'r') as f:
+        baseline = {r['concurrency']: r for r in json.load(f)}
+    failures = []
+    for result in results:
+        if result['failed_runs']:
+            failures.append(f"concurrency {result['concurrency']}: {result['failed_runs']} of {result['runs']} runs "
+                            f"failed: {'; '.join(result['errors'])}")
+        base = baseline.get(result['concurrency'])
+        if base is None:
+            continue
+        for key in ('p50_latency', 'p95_latency', 'peak_rss_mb'):
+            if result[key] > base[key] * (1 + tolerance):
+                failures.append(f"concurrency {result['concurrency']}: {key} {result[key]} > baseline {base[key]}")
+        if result['runs_per_minute'] < base['runs_per_minute'] * (1 - tolerance):
+            failures.append(f"concurrency {result['concurrency']}: runs_per_minute "
+                            f"{result['runs_per_minute']} < baseline {base['runs_per_minute']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 8, 32], help='Concurrency levels')
+    parser.add_argument('--runs', type=int, default=0, help='Runs per level, defaults to the concurrency level')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub latency per LLM response (s)')
+    parser.add_argument('--token-rate', type=float, default=0.0, help='Stub completion tokens per second')
+    parser.add_argument('--baseline', help='Fail when results regress against this baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--save-baseline', help='Write the results to this file')
+    parser.add_argument('--no-pool', action='store_true', help='Build new LLM clients for every crew')
+    parser.add_argument('--malformed', action='store_true', help='Stub answers with almost-valid JSON')
+    parser.add_argument('--no-repair', action='store_true', help='Leave invalid answers to the LLM converter')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.runs or args.worker, args.result_file)
+        return
+
+    sys.path.insert(0, BENCH_DIR)
+    from fake_llm_server import FakeLLMServer
+
+    results = []
+    with FakeLLMServer(latency=args.latency, token_rate=args.token_rate, malformed=args.malformed) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        for level in args.levels:
+            results.append(run_level(level, args.runs or level, server, workdir,
+                                     pool=not args.no_pool, repair=not args.no_repair))
+            print(json.dumps(results[-1]))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        failures = check_regressions(results, args.baseline, args.tolerance)
+        if failures:
+            sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
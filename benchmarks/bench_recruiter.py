@@ -0,0 +1,163 @@
+"""
+Recruiter mode throughput on a synthetic candidate pool.
+
+Writes ``--candidates`` generated markdown resumes to a temporary
+directory: ``--planted`` of them written for the benchmark job posting,
+a share with some of its requirements and the rest from unrelated
+professions. ``run_recruiter`` then extracts the requirements from the
+fixture page, prefilters the pool and scores the ``--top`` best against
+the local fake LLM server, ``--workers`` at a time. Reports the stage
+timings and throughput and exits non-zero when a planted candidate misses
+the shortlist, a scored candidate has a match score off the 0-100 scale or
+the prefilter handles fewer than ``--min-prefilter-rate`` candidates per
+second.
+
+    python benchmarks/bench_recruiter.py --candidates 500 --top 10
+    python benchmarks/bench_recruiter.py --candidates 2000 --latency 0.2 --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+JOB_URL = 'https://jobs.example.com/associate-15178'
+
+MATCHING = [
+    'Quantitative problem solving for strategy engagements in financial services',
+    'Data analysis and research on market sizing, presented to senior clients',
+    'Designed hypothesis testing frameworks to evaluate pricing experiments',
+    'Led independent workstreams as part of a consulting team of five',
+    'MBA, advanced graduate degree with a focus on corporate finance',
+    'Built models in spreadsheets and presentation software for board meetings',
+    'Healthcare systems and public sector projects across Europe',
+    'Strong logical reasoning and structured problem solving',
+]
+PROFESSIONS = {
+    'nursing': ['Administered medication and monitored patient vital signs on a surgical ward',
+                'Coordinated discharge plans with physicians and families',
+                'Registered nurse licence, basic life support certified',
+                'Trained new nursing staff on infection control protocols'],
+    'carpentry': ['Framed residential houses and installed roof trusses',
+                  'Read blueprints and estimated timber quantities for contractors',
+                  'Operated table saws, routers and nail guns safely',
+                  'Finished custom kitchen cabinets and staircases'],
+    'software': ['Developed REST services in Go and deployed them on Kubernetes',
+                 'Wrote React front ends with TypeScript and unit tests',
+                 'Maintained CI pipelines with GitHub Actions and Docker',
+                 'Profiled and optimized PostgreSQL queries'],
+    'hospitality': ['Managed front desk operations for a 200 room hotel',
+                    'Handled guest complaints and upgraded loyalty members',
+                    'Scheduled housekeeping shifts and ordered supplies',
+                    'Organised banquets and conference events'],
+    'logistics': ['Planned truck routes for regional deliveries',
+                  'Supervised warehouse staff and forklift operations',
+                  'Tracked inventory levels in the warehouse management system',
+                  'Negotiated freight rates with carriers'],
+}
+
+
+def make_resume(name: str, bullets: list) -> str:
+    lines = [f'# {name}', '', '## Experience', '']
+    lines += [f'- {bullet}' for bullet in bullets]
+    lines += ['', '## Education', '', '- Vocational and university courses']
+    return '\n'.join(lines) + '\n'
+
+
+def write_pool(directory: str, candidates: int, planted: int, seed: int = 7) -> list:
+    """Write the resumes and return the file names of the planted candidates."""
+    rng = random.Random(seed)
+    planted_names = []
+    for i in range(candidates):
+        profession = rng.choice(sorted(PROFESSIONS))
+        bullets = rng.sample(PROFESSIONS[profession], 3)
+        if i < planted:
+            bullets = rng.sample(MATCHING, 6) + bullets[:1]
+        elif i % 5 == 0:
+            # Some overlap with the job, so the prefilter has to rank.
+            bullets += rng.sample(MATCHING, 1)
+        rng.shuffle(bullets)
+        file_name = f'candidate-{i:05d}.md'
+        with open(os.path.join(directory, file_name), 'w') as f:
+            f.write(make_resume(f'Candidate {i}', bullets))
+        if i < planted:
+            planted_names.append(file_name)
+    return planted_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--candidates', type=int, default=500)
+    parser.add_argument('--planted', type=int, default=5, help='Candidates written for the job')
+    parser.add_argument('--top', type=int, default=10, help='Candidates scored by the LLM')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub latency per LLM response (s)')
+    parser.add_argument('--min-prefilter-rate', type=float, default=1000, help='Candidates per second')
+    args = parser.parse_args()
+    if args.planted > args.top:
+        parser.error('--planted cannot exceed --top, or planted candidates are bound to miss the shortlist')
+
+    workdir = tempfile.mkdtemp()
+    pool_dir = os.path.join(workdir, 'resumes')
+    os.makedirs(pool_dir)
+    planted = write_pool(pool_dir, args.candidates, args.planted)
+
+    sys.path.insert(0, BENCH_DIR)
+    from fake_llm_server import FakeLLMServer
+
+    with FakeLLMServer(latency=args.latency) as server:
+        os.environ.update({
+            'OPENAI_API_BASE': server.url,
+            'OPENAI_BASE_URL': server.url,
+            'OPENAI_API_KEY': 'stub',
+            'SCRAPE_OFFLINE': '1',
+            'SCRAPE_FIXTURES_DIR': os.path.join(FIXTURES_DIR, 'pages'),
+            'RESUME_CREW_CACHE_DIR': os.path.join(workdir, 'cache'),
+            'RESUME_CREW_OUTPUT_DIR': 'output',
+            'RESUME_CREW_LLM_CACHE': '0',
+            'CREWAI_DISABLE_TELEMETRY': 'true',
+            'OTEL_SDK_DISABLED': 'true',
+        })
+        # crewAI only accepts relative output paths.
+        os.chdir(workdir)
+        sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+        from resume_crew.recruiter import RANKING_COLUMNS, format_ranking, run_recruiter
+
+        manifest = run_recruiter(JOB_URL, [pool_dir], 'gpt-4o-mini', top_n=args.top, workers=args.workers)
+        requests = server.requests
+
+    stats = manifest['stats']
+    print(format_ranking(manifest['ranking'], limit=args.top))
+    print(json.dumps({**stats, 'llm_requests': requests}, indent=2))
+
+    failures = []
+    shortlisted = {r['candidate'] for r in manifest['ranking'] if r['shortlisted']}
+    missed = [name for name in planted if name not in shortlisted]
+    if missed:
+        failures.append(f"planted candidates not shortlisted: {', '.join(missed)}")
+    if stats['prefilter_per_second'] < args.min_prefilter_rate:
+        failures.append(f"prefilter handled {stats['prefilter_per_second']} candidates/s, "
+                        f"expected at least {args.min_prefilter_rate}")
+    if stats['failed']:
+        failures.append(f"{stats['failed']} shortlisted candidates could not be scored")
+    # Every score is a 0-100 percentage computed locally, or None for a
+    # category without skills; a value in (0, 1) is a 0-1 fraction from the
+    # LLM that slipped through.
+    score_columns = [c for c in RANKING_COLUMNS if c.endswith('_match')]
+    for row in manifest['ranking']:
+        if row['status'] != 'ok':
+            continue
+        off_scale = [f'{c}={row[c]}' for c in score_columns
+                     if row[c] is not None and (not 0 <= row[c] <= 100 or 0 < row[c] < 1)]
+        if off_scale:
+            failures.append(f"{row['candidate']}: scores not on a 0-100 scale: {', '.join(off_scale)}")
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
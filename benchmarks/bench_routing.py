@@ -0,0 +1,99 @@
+"""
+Model routing and fallback against local stub endpoints.
+
+Starts two fake LLM servers: a primary with ``--latency`` and
+``--error-rate``, and a fast, reliable fallback. A routing table with one
+route per server is written to a temporary file, loaded with
+``ModelRouter.from_file`` and ``--calls`` calls are made for the
+``analyze_job_task`` route, reporting where each call went and when the
+fallback policy switched.
+
+    python benchmarks/bench_routing.py --latency 0.5 --max-p95 0.3
+    python benchmarks/bench_routing.py --error-rate 0.5 --cooldown 1
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.0, help='Latency of the primary in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of failing primary requests')
+    parser.add_argument('--max-p95', type=float, default=0.3, help='p95 latency threshold in seconds')
+    parser.add_argument('--max-error-rate', type=float, default=0.25)
+    parser.add_argument('--window', type=int, default=10)
+    parser.add_argument('--min-calls', type=int, default=5)
+    parser.add_argument('--cooldown', type=float, default=60.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ.update({
+        'OPENAI_API_KEY': 'stub',
+        'RESUME_CREW_CACHE_DIR': os.path.join(workdir, 'cache'),
+        'RESUME_CREW_LLM_CACHE': '0',
+    })
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+    from crewai import Task
+    from fake_llm_server import FakeLLMServer
+    from resume_crew.routing import ModelRouter
+
+    with FakeLLMServer(latency=args.latency, error_rate=args.error_rate) as primary, FakeLLMServer() as fallback:
+        routes_file = os.path.join(workdir, 'models.yaml')
+        with open(routes_file, 'w') as f:
+            yaml.safe_dump({
+                'fallback_policy': {
+                    'window': args.window,
+                    'min_calls': args.min_calls,
+                    'max_p95_latency': args.max_p95,
+                    'max_error_rate': args.max_error_rate,
+                    'cooldown': args.cooldown,
+                },
+                'tasks': {
+                    'analyze_job_task': {
+                        'model': 'openai/stub-primary',
+                        'api_base': primary.url,
+                        'fallback': {'model': 'openai/stub-fallback', 'api_base': fallback.url},
+                    },
+                },
+            }, f)
+
+        router = ModelRouter.from_file('openai/stub-default', routes_file)
+        llm = router.llm('job_analyzer', num_retries=0)
+        task = Task(name='analyze_job_task', description='Routing benchmark', expected_output='Anything')
+        messages = [{'role': 'user', 'content': 'Return the JobRequirements'}]
+        health = llm.task_llms['analyze_job_task'].health
+
+        failures = 0
+        switched_at = None
+        start = time.perf_counter()
+        for i in range(args.calls):
+            before = fallback.requests
+            try:
+                llm.call(messages, from_task=task)
+            except Exception:
+                failures += 1
+            if switched_at is None and fallback.requests > before:
+                switched_at = i + 1
+        elapsed = time.perf_counter() - start
+
+    print(f"calls            {args.calls}")
+    print(f"primary requests {primary.requests} ({primary.errors} failed)")
+    print(f"fallback requests {fallback.requests}")
+    print(f"failed calls     {failures}")
+    print(f"switched at call {switched_at or '-'}")
+    print(f"primary p95      {health.p95_latency:.3f}s  error rate {health.error_rate:.0%}")
+    print(f"wall time        {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
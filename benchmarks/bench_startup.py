@@ -0,0 +1,88 @@
+"""
+Import time of the CLI and Streamlit entry points, checked against a budget.
+
+Runs ``python -X importtime`` in a fresh interpreter for each entry point:
+``resume_crew.main`` for the CLI, and the module-level imports of
+``app.py`` for the Streamlit app (executing the script itself would render
+the page). The fastest of ``--repeat`` runs is reported with its heaviest
+imports. Exits non-zero when an entry point exceeds its budget or loads one
+of the libraries that must only be imported on first use.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-cli 300 --budget-app 1500
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+# Imported by the commands and callbacks that need them, never at startup.
+LAZY_MODULES = ('crewai', 'crewai_tools', 'litellm', 'fpdf', 'markdown')
+
+
+def app_imports(app_file: str) -> str:
+    """The top-level import statements of a script, as source."""
+    with open(app_file, 'r') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return '\n'.join(ast.get_source_segment(source, node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def import_profile(code: str) -> dict:
+    """Total import time (ms), the imported modules and the heaviest top-level imports."""
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join([os.path.join(REPO_ROOT, 'src'), REPO_ROOT, os.environ.get('PYTHONPATH', '')]),
+    }
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, cwd=REPO_ROOT,
+                          stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True)
+    total = 0
+    modules = set()
+    heaviest = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total += int(self_us)
+        modules.add(name.strip())
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            heaviest.append((int(cumulative_us) / 1000, name.strip()))
+    heaviest.sort(reverse=True)
+    return {'ms': total / 1000, 'modules': modules, 'heaviest': heaviest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-cli', type=float, default=300, help='Import budget of resume_crew.main (ms)')
+    parser.add_argument('--budget-app', type=float, default=1500, help='Import budget of app.py (ms)')
+    parser.add_argument('--top', type=int, default=5, help='Heaviest imports to list')
+    args = parser.parse_args()
+
+    entry_points = [
+        ('cli', 'import resume_crew.main', args.budget_cli),
+        ('app', app_imports(os.path.join(REPO_ROOT, 'app.py')), args.budget_app),
+    ]
+    failures = []
+    for name, code, budget in entry_points:
+        profile = min((import_profile(code) for _ in range(args.repeat)), key=lambda p: p['ms'])
+        print(f"{name:<4} {profile['ms']:8.1f} ms  (budget {budget:.0f} ms)")
+        for ms, module in profile['heaviest'][:args.top]:
+            print(f"       {ms:8.1f} ms  {module}")
+        if profile['ms'] > budget:
+            failures.append(f"{name}: imports take {profile['ms']:.0f} ms, budget {budget:.0f} ms")
+        loaded = sorted(m for m in LAZY_MODULES if m in profile['modules'])
+        if loaded:
+            failures.append(f"{name}: imports {', '.join(loaded)} at startup")
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
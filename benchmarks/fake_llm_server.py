@@ -0,0 +1,233 @@
+"""
+OpenAI-compatible stub server returning canned crew answers.
+
+Every chat completion is answered from the sample outputs in ``output/``,
+picked by the task the prompt belongs to. Agents that have the scrape or
+search tool first get an Action for that tool, so the tool fixtures are
+exercised too. Latency is ``latency + completion_tokens / token_rate``;
+streaming requests get one ~4 character chunk per token. ``error_rate`` of
+the requests fail with a 500, to exercise the model fallback. With
+``malformed`` the JSON answers come back the way models often get them
+wrong, to exercise the output repair. Connections are kept alive
+(HTTP/1.1) and counted in ``connections``.
+
+    python benchmarks/fake_llm_server.py --port 8765 --latency 0.2 --token-rate 200
+    export OPENAI_API_BASE=http://127.0.0.1:8765/v1
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (marker in the prompt, canned answer file) - checked in order. A
+# ``file:key`` answer is one field of a JSON file.
+RESPONSES = [
+    ('JobRequirements', 'job_analysis.json'),
+    ('JobMatchScore', 'job_analysis.json:match_score'),
+    ('ResumeOptimization', 'resume_optimization.json'),
+    ('CompanyResearch', 'company_research.json'),
+    ('markdown resume', 'optimized_resume.md'),
+    ('', 'final_report.md'),
+]
+
+TOOL_ACTIONS = [
+    ('Tool Name: Read website content', 'Read website content',
+     lambda prompt: {'website_url': (re.findall(r'https?://[^\s\'"]+', prompt) or [''])[0]}),
+    ('Tool Name: Search the internet with Serper', 'Search the internet with Serper',
+     lambda prompt: {'search_query': (re.findall(r'Research (.+?) and prepare the latest', prompt) or ['company'])[0]}),
+]
+
+
+# Fields constrained to 0-1 that models like to fill with percentages.
+UNIT_FIELDS = ('match_level', 'context_score')
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def malform(answer: str) -> str:
+    """A JSON answer with percentages in 0-1 fields, trailing commas and a code fence."""
+    def scale(value):
+        if isinstance(value, dict):
+            return {k: round(v * 100) if k in UNIT_FIELDS and isinstance(v, (int, float)) else scale(v)
+                    for k, v in value.items()}
+        if isinstance(value, list):
+            return [scale(item) for item in value]
+        return value
+
+    text = json.dumps(scale(json.loads(answer)), indent=2)
+    text = re.sub(r'([\]}"\d])(\n\s*[\]}])', r'\1,\2', text)
+    return f"```json\n{text}\n```"
+
+
+class FakeLLMServer:
+    """Threaded stub server; use as a context manager to run it in the background."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 token_rate: float = 0.0, responses_dir: str = os.path.join(REPO_ROOT, 'output'),
+                 error_rate: float = 0.0, malformed: bool = False):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.answers = {}
+        for _, answer in RESPONSES:
+            file_name, _, key = answer.partition(':')
+            with open(os.path.join(responses_dir, file_name), 'r') as f:
+                content = f.read()
+            if file_name.endswith('.json'):
+                content = json.dumps(json.loads(content)[key] if key else json.loads(content))
+                if malformed:
+                    content = malform(content)
+            self.answers[answer] = content
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def complete(self, messages: list) -> str:
+        prompt = '\n'.join(str(m.get('content', '')) for m in messages)
+        first_turn = not any(m.get('role') == 'assistant' for m in messages)
+        if first_turn:
+            for marker, tool_name, tool_input in TOOL_ACTIONS:
+                if marker in prompt:
+                    return (f"Thought: I should use a tool first\nAction: {tool_name}\n"
+                            f"Action Input: {json.dumps(tool_input(prompt))}")
+        for marker, file_name in RESPONSES:
+            if marker in prompt:
+                return f"Thought: I now know the final answer\nFinal Answer: {self.answers[file_name]}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                server.requests += 1
+                if server.error_rate and random.random() < server.error_rate:
+                    server.errors += 1
+                    time.sleep(server.latency)
+                    self.send_error(500, 'Injected failure')
+                    return
+                messages = body.get('messages', [])
+                content = server.complete(messages)
+                prompt_tokens = count_tokens(''.join(str(m.get('content', '')) for m in messages))
+                completion_tokens = count_tokens(content)
+                if body.get('stream'):
+                    self._stream(body, content, prompt_tokens, completion_tokens)
+                    return
+                delay = server.latency
+                if server.token_rate:
+                    delay += completion_tokens / server.token_rate
+                time.sleep(delay)
+                payload = json.dumps({
+                    'id': f'chatcmpl-{uuid.uuid4().hex}',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': body.get('model', 'stub'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': 'stop',
+                    }],
+                    'usage': {
+                        'prompt_tokens': prompt_tokens,
+                        'completion_tokens': completion_tokens,
+                        'total_tokens': prompt_tokens + completion_tokens,
+                    },
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, body, content, prompt_tokens, completion_tokens):
+                """Server-sent events, one ~4 character token per chunk at ``token_rate``."""
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                # No Content-Length: the end of the stream is the end of the connection.
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                time.sleep(server.latency)
+                chunk_id = f'chatcmpl-{uuid.uuid4().hex}'
+
+                def send(delta, finish_reason=None, usage=None):
+                    event = {
+                        'id': chunk_id,
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': body.get('model', 'stub'),
+                        'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+                    }
+                    if usage:
+                        event['usage'] = usage
+                    self.wfile.write(f'data: {json.dumps(event)}\n\n'.encode())
+                    self.wfile.flush()
+
+                send({'role': 'assistant', 'content': ''})
+                for i in range(0, len(content), 4):
+                    if server.token_rate:
+                        time.sleep(1 / server.token_rate)
+                    send({'content': content[i:i + 4]})
+                send({}, 'stop', {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens,
+                })
+                self.wfile.write(b'data: [DONE]\n\n')
+
+        return Handler
+
+    def __enter__(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--token-rate', type=float, default=0.0, help='Completion tokens per second, 0 for instant')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 500')
+    parser.add_argument('--malformed', action='store_true', help='Answer with almost-valid JSON')
+    args = parser.parse_args()
+    server = FakeLLMServer(args.host, args.port, args.latency, args.token_rate, error_rate=args.error_rate,
+                           malformed=args.malformed)
+    print(f'Serving fake OpenAI API on {server.url}')
+    server.httpd.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
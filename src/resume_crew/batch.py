@@ -0,0 +1,145 @@
+import csv
+import json
+import math
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from .crew import ResumeCrew
+from .ingest import load_resume_markdown
+from .instrumentation import RunMetrics
+from .models import JobRequirements
+from .outputs import new_run_id, output_path, run_output_dir
+from .scheduler import ParallelScheduler
+from .scoring import score_matches
+
+
+def load_jobs(jobs_file: str) -> List[Dict[str, str]]:
+    """
+    Read the jobs to process from a CSV or JSONL file.
+
+    Every row/line needs a ``job_url`` and a ``company_name``; other keys are
+    kept and copied to the manifest.
+    """
+    with open(jobs_file, 'r', newline='') as f:
+        if jobs_file.endswith('.csv'):
+            jobs = [dict(row) for row in csv.DictReader(f)]
+        else:
+            jobs = [json.loads(line) for line in f if line.strip()]
+    for i, job in enumerate(jobs):
+        missing = [k for k in ('job_url', 'company_name') if not job.get(k)]
+        if missing:
+            raise ValueError(f"Job #{i + 1} in {jobs_file} is missing {', '.join(missing)}")
+    return jobs
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def score_results(results: List[dict]) -> None:
+    """
+    Add the overall match score of every successful run to its record.
+
+    All job analyses are rescored in a single vectorized call, so the
+    numbers are comparable across jobs whatever the model wrote.
+    """
+    scored, matches = [], []
+    for record in results:
+        if record['status'] != 'ok':
+            continue
+        try:
+            with open(output_path('job_analysis.json', record['run_id']), 'r') as f:
+                matches.append(JobRequirements.model_validate_json(f.read()).match_score)
+        except (OSError, ValueError):
+            continue
+        scored.append(record)
+    for record, row in zip(scored, score_matches(matches)):
+        record['overall_match'] = round(float(row[-1]), 2)
+
+
+def run_batch(jobs_file: str, resume_file: str, llm_model: str, workers: int = 4,
+              parallel: bool = False, manifest_file: str = 'output/batch_manifest.json',
+              pdf: bool = False) -> dict:
+    """
+    Run the crew for every job in ``jobs_file`` against a single resume.
+
+    The resume is converted once and shared by all crews. Up to ``workers``
+    crews run at the same time, each writing to its own run directory. A
+    manifest with the run id, status and latency of every job plus aggregate
+    throughput stats is written to ``manifest_file`` and returned. With ``pdf``
+    the outputs of every successful run are exported to PDF afterwards, spread
+    over a process pool.
+    """
+    jobs = load_jobs(jobs_file)
+    md_file_path = load_resume_markdown(os.path.join('input', resume_file))
+
+    def run_job(job: dict) -> dict:
+        inputs = {'job_url': job['job_url'], 'company_name': job['company_name']}
+        run_id = new_run_id()
+        record = {
+            **job,
+            'run_id': run_id,
+            'output_dir': run_output_dir(run_id),
+            'started_at': datetime.now(timezone.utc).isoformat(),
+        }
+        start = time.perf_counter()
+        try:
+            crew = ResumeCrew(resume_file, llm_model, md_file_path=md_file_path, run_id=run_id).crew()
+            with RunMetrics(crew, metrics_file=output_path('metrics.jsonl', run_id)) as metrics:
+                if parallel:
+                    timings_file = output_path('task_timings.json', run_id)
+                    ParallelScheduler(crew, timings_file=timings_file).kickoff(inputs=inputs)
+                else:
+                    crew.kickoff(inputs=inputs)
+            record['status'] = 'ok'
+            record['tokens'] = sum(r['prompt_tokens'] + r['completion_tokens'] for r in metrics.summary())
+            record['cost'] = round(sum(r['cost'] for r in metrics.summary()), 4)
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = f"{e}\n{traceback.format_exc()}"
+        record['latency'] = round(time.perf_counter() - start, 3)
+        return record
+
+    start = time.perf_counter()
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    wall_time = time.perf_counter() - start
+
+    latencies = [r['latency'] for r in results if r['status'] == 'ok']
+    score_results(results)
+    if pdf:
+        from .pdf_export import export_runs
+        succeeded = [r for r in results if r['status'] == 'ok']
+        for record, export in zip(succeeded, export_runs([r['run_id'] for r in succeeded])):
+            record['pdf_file'] = export['pdf_file']
+    manifest = {
+        'resume_file': resume_file,
+        'llm_model': llm_model,
+        'workers': workers,
+        'stats': {
+            'jobs': len(jobs),
+            'succeeded': len(latencies),
+            'failed': len(jobs) - len(latencies),
+            'wall_time': round(wall_time, 3),
+            'jobs_per_minute': round(len(jobs) / wall_time * 60, 2) if wall_time else 0.0,
+            'p50_latency': percentile(latencies, 50),
+            'p95_latency': percentile(latencies, 95),
+        },
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(manifest_file) or '.', exist_ok=True)
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+DEFAULT_CACHE_DIR = os.environ.get('RESUME_CREW_CACHE_DIR', '.cache/resume_crew')
+
+
+@dataclass
+class CacheEntry:
+    """A single cached value together with its bookkeeping data."""
+    key: str
+    value: Any
+    created_at: float
+    expires_at: Optional[float] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+
+class DiskCache:
+    """
+    Persistent key/value store backed by a single SQLite file.
+
+    Values and metadata must be JSON serializable. Entries can carry an
+    optional TTL, and the store is bounded by ``max_bytes``: when the total
+    size of the stored values exceeds it, the least recently used entries
+    are evicted. Hit, miss and eviction counters are persisted alongside the
+    data so they survive across runs.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, default_ttl: Optional[float] = None):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY, value TEXT NOT NULL, meta TEXT NOT NULL,'
+            ' size INTEGER NOT NULL, created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL, expires_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value REAL NOT NULL)')
+
+    def get_entry(self, key: str, include_expired: bool = False) -> Optional[CacheEntry]:
+        """
+        Return the entry stored under ``key``, or None on a miss.
+
+        Expired entries count as misses unless ``include_expired`` is set,
+        which lets callers revalidate stale data instead of refetching it.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, meta, created_at, expires_at FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            entry = None
+            if row is not None:
+                entry = CacheEntry(key, json.loads(row[0]), row[2], row[3], json.loads(row[1]))
+                if entry.expired and not include_expired:
+                    entry = None
+            if entry is None:
+                self._incr('misses')
+                return None
+            self._incr('hits')
+            self._conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, meta, size, created_at, accessed_at, expires_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, payload, json.dumps(meta or {}), len(payload), now, now,
+                 now + ttl if ttl is not None else None)
+            )
+            self._evict()
+
+    def touch(self, key: str, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Extend the lifetime of an entry (e.g. after a successful revalidation)."""
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE entries SET expires_at = ?, accessed_at = ? WHERE key = ?',
+                (now + ttl if ttl is not None else None, now, key)
+            )
+            if meta is not None:
+                self._conn.execute('UPDATE entries SET meta = ? WHERE key = ?', (json.dumps(meta), key))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.execute('DELETE FROM counters')
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        """Increment a custom persisted counter reported by ``stats``."""
+        with self._lock:
+            self._incr(name, amount)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+            counters = dict(self._conn.execute('SELECT name, value FROM counters').fetchall())
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, **counters, 'entries': entries, 'size': size}
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _incr(self, name: str, amount: float = 1) -> None:
+        self._conn.execute(
+            'INSERT INTO counters (name, value) VALUES (?, ?)'
+            ' ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+            (name, amount)
+        )
+
+    def _evict(self) -> None:
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self._incr('evictions', evicted)
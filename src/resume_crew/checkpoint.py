@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+
+from .cache import DiskCache, DEFAULT_CACHE_DIR
+from .context import CompactContextTask
+from .repair import RepairedOutputTask
+
+
+# Bump whenever the stored format or the key derivation changes.
+CHECKPOINT_VERSION = '2'
+
+_checkpoint_store = None
+
+
+def get_checkpoint_store() -> DiskCache:
+    """Process-wide store of task outputs, keyed by checkpoint key."""
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        _checkpoint_store = DiskCache(
+            os.path.join(DEFAULT_CACHE_DIR, 'checkpoints.sqlite'),
+            max_bytes=int(os.environ.get('CHECKPOINT_MAX_BYTES', 128 * 1024 * 1024))
+        )
+    return _checkpoint_store
+
+
+def checkpoints_enabled() -> bool:
+    return os.environ.get('RESUME_CREW_CHECKPOINTS', '1') != '0'
+
+
+def _output_digest(task) -> Optional[str]:
+    """Hash of an upstream task's output, or its key while it has none yet."""
+    if task.output is None:
+        return task.checkpoint_key
+    return hashlib.sha256(task.output.raw.encode()).hexdigest()
+
+
+class CheckpointedTask(RepairedOutputTask, CompactContextTask):
+    """
+    Task whose output is reused when nothing it depends on has changed.
+
+    The checkpoint key hashes the interpolated prompt (so the job URL or
+    company name it mentions), the expected output and output model, the
+    agent's prompt and model, ``checkpoint_inputs`` (the resume hash) and the
+    outputs of the upstream tasks. A run therefore skips every task up to the
+    first one whose key changed, e.g. after a provider error in a late task
+    or when only the company name is different. Structured answers are
+    repaired locally before crewAI asks the LLM to convert them.
+
+    Tasks with tools that fetch live data (the scraper, the search) keep
+    their checkpoint for ``checkpoint_ttl`` seconds, by default as long as
+    the shortest-lived tool cache, so a changed job posting is read again
+    and every task built on it reruns once its output differs.
+    """
+    checkpoint_inputs: Dict[str, str] = {}
+    checkpoint: bool = True
+    checkpoint_ttl: Optional[float] = None
+    checkpoint_key: Optional[str] = None
+    restored: bool = False
+
+    def compute_checkpoint_key(self) -> str:
+        agent = self.agent
+        llm = getattr(agent, 'llm', None)
+        upstream = self.context if isinstance(self.context, list) else []
+        payload = {
+            'version': CHECKPOINT_VERSION,
+            'task': self.name,
+            'description': self.description,
+            'expected_output': self.expected_output,
+            'output_model': self.output_pydantic.__name__ if self.output_pydantic else None,
+            'output_schema': self.output_pydantic.model_json_schema() if self.output_pydantic else None,
+            'agent': [agent.role, agent.goal, agent.backstory] if agent else None,
+            'model': llm.model_for(self.name) if hasattr(llm, 'model_for') else getattr(llm, 'model', None),
+            'temperature': getattr(llm, 'temperature', None),
+            'inputs': self.checkpoint_inputs,
+            'upstream': [_output_digest(task) for task in upstream if isinstance(task, CheckpointedTask)],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def live_data_ttl(self) -> Optional[float]:
+        """``checkpoint_ttl``, or the shortest ``ttl`` of the task's and its agent's tools."""
+        if self.checkpoint_ttl is not None:
+            return self.checkpoint_ttl
+        tools = list(self.tools or []) + list(getattr(self.agent, 'tools', None) or [])
+        ttls = [tool.ttl for tool in tools if isinstance(getattr(tool, 'ttl', None), (int, float))]
+        return min(ttls) if ttls else None
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        if agent is not None:
+            self.agent = agent
+        self.checkpoint_key = self.compute_checkpoint_key()
+        self.restored = False
+        enabled = self.checkpoint and checkpoints_enabled()
+        store = get_checkpoint_store() if enabled else None
+        if enabled:
+            stored = store.get(self.checkpoint_key)
+            if stored is not None:
+                print(f"Skipping {self.name}: unchanged since checkpoint {self.checkpoint_key[:12]}")
+                return self._restore(stored)
+
+        output = super().execute_sync(agent=agent, context=context, tools=tools)
+        if enabled:
+            store.set(self.checkpoint_key, {
+                'raw': output.raw,
+                'pydantic': output.pydantic.model_dump(mode='json') if output.pydantic else None,
+                'json_dict': output.json_dict,
+                'agent': output.agent,
+            }, ttl=self.live_data_ttl())
+        return output
+
+    def _restore(self, stored: dict) -> TaskOutput:
+        pydantic_output = None
+        if stored['pydantic'] is not None and self.output_pydantic:
+            pydantic_output = self.output_pydantic.model_validate(stored['pydantic'])
+        output = TaskOutput(
+            name=self.name,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=stored['raw'],
+            pydantic=pydantic_output,
+            json_dict=stored['json_dict'],
+            agent=stored['agent'],
+            output_format=OutputFormat.PYDANTIC if pydantic_output else OutputFormat.RAW,
+        )
+        self.output = output
+        self.restored = True
+        if self.output_file:
+            # Every run has its own directory, so the file is written again.
+            os.makedirs(os.path.dirname(self.output_file) or '.', exist_ok=True)
+            with open(self.output_file, 'w') as f:
+                f.write(pydantic_output.model_dump_json() if pydantic_output else stored['raw'])
+        return output
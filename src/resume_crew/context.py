@@ -0,0 +1,200 @@
+import json
+import os
+from typing import Any, Callable, List, Optional, Tuple
+
+from crewai import Task
+from pydantic import BaseModel
+
+from .tokens import count_tokens
+
+
+DEFAULT_CONTEXT_BUDGET = int(os.environ.get('CONTEXT_TOKEN_BUDGET', 3000))
+
+# Separator crewAI puts between upstream outputs in a task's context.
+DIVIDERS = '\n\n----------\n\n'
+
+TRUNCATION_NOTE = '[Context truncated to fit the token budget: some fields or text were left out.]'
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == [] or value == {}
+
+
+def compact_value(value: Any) -> Any:
+    """
+    Recursively drop empty values, model fields left at their default and
+    repeated strings within a list. Lists of different fields keep their
+    entries, even when they overlap: a required skill is also a keyword to
+    highlight.
+    """
+    if isinstance(value, BaseModel):
+        compact = {}
+        for name, field in type(value).model_fields.items():
+            item = getattr(value, name)
+            if not field.is_required() and item == field.get_default(call_default_factory=True):
+                continue
+            item = compact_value(item)
+            if not _is_empty(item):
+                compact[name] = item
+        return compact
+    if isinstance(value, dict):
+        compact = {k: compact_value(v) for k, v in value.items()}
+        return {k: v for k, v in compact.items() if not _is_empty(v)}
+    if isinstance(value, (list, tuple)):
+        compact, seen = [], set()
+        for item in value:
+            if isinstance(item, str):
+                key = item.strip().lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+            item = compact_value(item)
+            if not _is_empty(item):
+                compact.append(item)
+        return compact
+    return value
+
+
+def _minify(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _longest_list(value: Any, best: Optional[list] = None) -> Optional[list]:
+    """The list with the longest serialization among those with 2+ items."""
+    if isinstance(value, dict):
+        for item in value.values():
+            best = _longest_list(item, best)
+    elif isinstance(value, list):
+        if len(value) > 1 and (best is None or len(_minify(value)) > len(_minify(best))):
+            best = value
+        for item in value:
+            best = _longest_list(item, best)
+    return best
+
+
+def _drop_largest(value: Any) -> None:
+    """Remove the largest field of ``value`` (inside nested objects first), or its last list item."""
+    if isinstance(value, dict):
+        key = max(value, key=lambda k: len(_minify(value[k])))
+        if isinstance(value[key], dict) and len(value[key]) > 1:
+            _drop_largest(value[key])
+        else:
+            del value[key]
+    else:
+        value.pop()
+
+
+def _cut(text: str, fits: Callable[[str], bool]) -> str:
+    """The longest prefix of whole lines (or words, for a single line) of ``text`` that ``fits``."""
+    sep = '\n' if '\n' in text.strip() else ' '
+    units = text.split(sep)
+    low, high = 0, len(units)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(sep.join(units[:middle])):
+            low = middle
+        else:
+            high = middle - 1
+    return sep.join(units[:low]).rstrip()
+
+
+def _fit(parts: List[Any], budget: int) -> str:
+    """
+    Serialize the parts within ``budget`` tokens. The longest lists are
+    shortened first; then the largest part loses its largest field, or, for
+    plain text, is cut at a line or word boundary. The JSON stays valid, and
+    a note tells the agent when anything besides list entries was left out.
+    """
+    parts = list(parts)
+
+    def render():
+        return DIVIDERS.join(p if isinstance(p, str) else _minify(p) for p in parts)
+
+    def size(part: Any) -> int:
+        return len(part if isinstance(part, str) else _minify(part))
+
+    text = render()
+    note = None
+    while budget and count_tokens(text) > budget:
+        candidates = [c for c in (_longest_list(p) for p in parts if not isinstance(p, str)) if c]
+        if candidates:
+            max(candidates, key=lambda c: len(_minify(c))).pop()
+        else:
+            if note is None:
+                parts.append(TRUNCATION_NOTE)
+                note = len(parts) - 1
+            # Shorten the largest part: drop a field, or cut the text down to
+            # the size of the next largest part (or less, if that fits).
+            shrinkable = sorted((i for i, p in enumerate(parts) if p and i != note), key=lambda i: size(parts[i]))
+            if not shrinkable:
+                break
+            i = shrinkable[-1]
+            if not isinstance(parts[i], str):
+                _drop_largest(parts[i])
+            else:
+                original = parts[i]
+                floor = size(parts[shrinkable[-2]]) if len(shrinkable) > 1 else 0
+
+                def fits(prefix: str) -> bool:
+                    parts[i] = prefix
+                    return len(prefix) <= floor or count_tokens(render()) <= budget
+
+                shortened = _cut(original, fits)
+                if shortened == original:
+                    shortened = _cut(original, lambda prefix: len(prefix) < len(original))
+                parts[i] = shortened
+        text = render()
+    return text
+
+
+def compact_context(tasks: List[Task], budget: int = DEFAULT_CONTEXT_BUDGET) -> Tuple[str, int, int]:
+    """
+    Build the context string for a task from the outputs of ``tasks``.
+
+    Structured outputs are serialized as minified JSON without empty or
+    default fields and without repeated list entries; plain text outputs
+    are kept as they are. See ``_fit`` for how it is shortened to the
+    budget. Returns the context together with the token
+    counts of the regular (raw) context and of the compacted one.
+    """
+    outputs = [task.output for task in tasks if task.output is not None]
+    if not outputs:
+        return '', 0, 0
+    original = count_tokens(DIVIDERS.join(output.raw for output in outputs))
+    parts = []
+    for output in outputs:
+        if output.pydantic is not None:
+            parts.append(compact_value(output.pydantic))
+        elif output.json_dict:
+            parts.append(compact_value(output.json_dict))
+        else:
+            parts.append(output.raw)
+    text = _fit(parts, budget)
+    return text, original, count_tokens(text)
+
+
+class CompactContextTask(Task):
+    """
+    Task that receives a compacted version of its upstream outputs.
+
+    Whatever context the crew or the scheduler passes in is replaced by
+    ``compact_context`` of the tasks in ``context``, limited to
+    ``context_token_budget`` tokens. The token counts before and after
+    compaction are printed and kept in ``context_tokens``.
+    """
+    context_token_budget: int = DEFAULT_CONTEXT_BUDGET
+    context_tokens: Optional[Tuple[int, int]] = None
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        return super().execute_sync(agent=agent, context=self._compact(context), tools=tools)
+
+    def execute_async(self, agent=None, context=None, tools=None):
+        return super().execute_async(agent=agent, context=self._compact(context), tools=tools)
+
+    def _compact(self, context: Optional[str]) -> Optional[str]:
+        if not context or not isinstance(self.context, list):
+            return context
+        compacted, before, after = compact_context(self.context, self.context_token_budget)
+        self.context_tokens = (before, after)
+        print(f"Context for {self.name}: {before} -> {after} tokens")
+        return compacted
@@ -1,12 +1,20 @@
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool, FileReadTool
-from utils.convert2md import file2md
+from .checkpoint import CheckpointedTask
+from .ingest import convert_resume, load_resume_markdown
+from .outputs import new_run_id, output_path
+from .routing import DEFAULT_ROUTES_FILE, ModelRouter
+from .tools.cached_scrape_tool import CachedScrapeWebsiteTool
+from .tools.cached_search_tool import CachedSerperDevTool
+from .tools.resume_read_tool import ResumeReadTool
+from .tools.resume_search_tool import ResumeSearchTool
 from .models import (
+    JobMatchScore,
     JobRequirements,
     ResumeOptimization,
     CompanyResearch
 )
+import hashlib
 import os
 
 
@@ -17,23 +25,47 @@ class ResumeCrew():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    def __init__(self, file_path: str, llm_model: str) -> None:
-        """Load CV from pdf"""
-        md_file_path = file2md(os.path.join('input', file_path))
-        self.resume_file_read_tool = FileReadTool(
-            file_path=md_file_path,
-            description='A tool to read the CV file.'
-        )
+    def __init__(self, file_path: str, llm_model: str, md_file_path: str = None, run_id: str = None,
+                 stream: bool = False, checkpoint: bool = True, routes_file: str = None,
+                 resume_data: bytes = None) -> None:
+        """
+        Load CV from pdf, or reuse an already converted markdown file.
+
+        ``resume_data`` (bytes or a memoryview, e.g. an upload) is converted
+        in memory instead, with ``file_path`` only naming it. Either way the
+        tools get the markdown text, not a file.
+
+        Only the resume writer reads the whole CV; the other agents search it
+        for the parts relevant to the job. With ``stream`` the LLM responses
+        are streamed, so a RunStream can show them while they are generated.
+        Unless ``checkpoint`` is False, tasks whose inputs did not change since
+        an earlier run reuse that run's output. ``routes_file`` (by default
+        config/models.yaml) assigns models to agents and tasks, with
+        ``llm_model`` as the default.
+        """
+        self.run_id = run_id or new_run_id()
+        if resume_data is not None:
+            resume_markdown = convert_resume(resume_data, file_path)
+        else:
+            if md_file_path is None:
+                md_file_path = load_resume_markdown(os.path.join('input', file_path))
+            with open(md_file_path, 'r') as f:
+                resume_markdown = f.read()
+        self.resume_file_read_tool = ResumeReadTool(markdown=resume_markdown)
+        self.resume_search_tool = ResumeSearchTool(markdown=resume_markdown)
+        self.resume_hash = hashlib.sha256(resume_markdown.encode()).hexdigest()
+        self.checkpoint = checkpoint
         self.llm_model = llm_model
-        self.llm = LLM(llm_model)
+        self.stream = stream
+        self.router = ModelRouter.from_file(llm_model, routes_file or DEFAULT_ROUTES_FILE)
 
     @agent
     def resume_analyzer(self) -> Agent:
         return Agent(
             config=self.agents_config['resume_analyzer'],
             verbose=True,
-            llm=LLM(self.llm_model, temperature=0),
-            tools = [self.resume_file_read_tool]
+            llm=self.router.llm('resume_analyzer', temperature=0, stream=self.stream),
+            tools = [self.resume_search_tool]
             # knowledge_sources=[self.resume_pdf]
         )
     
@@ -42,8 +74,8 @@ class ResumeCrew():
         return Agent(
             config=self.agents_config['job_analyzer'],
             verbose=True,
-            tools=[ScrapeWebsiteTool()],
-            llm=self.llm
+            tools=[CachedScrapeWebsiteTool(), self.resume_search_tool],
+            llm=self.router.llm('job_analyzer', stream=self.stream)
         )
 
     @agent
@@ -51,8 +83,8 @@ class ResumeCrew():
         return Agent(
             config=self.agents_config['company_researcher'],
             verbose=True,
-            tools=[SerperDevTool(), self.resume_file_read_tool],
-            llm=self.llm,
+            tools=[CachedSerperDevTool(), self.resume_search_tool],
+            llm=self.router.llm('company_researcher', stream=self.stream),
             # knowledge_sources=[self.resume_pdf]
         )
 
@@ -61,7 +93,8 @@ class ResumeCrew():
         return Agent(
             config=self.agents_config['resume_writer'],
             verbose=True,
-            llm=self.llm
+            tools=[self.resume_file_read_tool],
+            llm=self.router.llm('resume_writer', stream=self.stream)
         )
 
     @agent
@@ -69,45 +102,55 @@ class ResumeCrew():
         return Agent(
             config=self.agents_config['report_generator'],
             verbose=True,
-            llm=self.llm
+            llm=self.router.llm('report_generator', stream=self.stream)
         )
 
     @task
     def analyze_job_task(self) -> Task:
-        return Task(
+        return CheckpointedTask(
             config=self.tasks_config['analyze_job_task'],
-            output_file='output/job_analysis.json',
+            checkpoint_inputs={'resume': self.resume_hash},
+            checkpoint=self.checkpoint,
+            output_file=output_path('job_analysis.json', self.run_id),
             output_pydantic=JobRequirements
         )
 
     @task
     def optimize_resume_task(self) -> Task:
-        return Task(
+        return CheckpointedTask(
             config=self.tasks_config['optimize_resume_task'],
-            output_file='output/resume_optimization.json',
+            checkpoint_inputs={'resume': self.resume_hash},
+            checkpoint=self.checkpoint,
+            output_file=output_path('resume_optimization.json', self.run_id),
             output_pydantic=ResumeOptimization
         )
 
     @task
     def research_company_task(self) -> Task:
-        return Task(
+        return CheckpointedTask(
             config=self.tasks_config['research_company_task'],
-            output_file='output/company_research.json',  
+            checkpoint_inputs={'resume': self.resume_hash},
+            checkpoint=self.checkpoint,
+            output_file=output_path('company_research.json', self.run_id),
             output_pydantic=CompanyResearch
         )
 
     @task
     def generate_resume_task(self) -> Task:
-        return Task(
+        return CheckpointedTask(
             config=self.tasks_config['generate_resume_task'],
-            output_file='output/optimized_resume.md'
+            checkpoint_inputs={'resume': self.resume_hash},
+            checkpoint=self.checkpoint,
+            output_file=output_path('optimized_resume.md', self.run_id),
         )
 
     @task
     def generate_report_task(self) -> Task:
-        return Task(
+        return CheckpointedTask(
             config=self.tasks_config['generate_report_task'],
-            output_file='output/final_report.md'
+            checkpoint_inputs={'resume': self.resume_hash},
+            checkpoint=self.checkpoint,
+            output_file=output_path('final_report.md', self.run_id),
         )
 
     @crew
@@ -118,5 +161,68 @@ class ResumeCrew():
             verbose=True,
             process=Process.sequential,
             # knowledge_sources=[self.resume_pdf]
-            tools = [self.resume_file_read_tool]
+            tools = [self.resume_search_tool]
         )
+
+
+@CrewBase
+class RecruiterCrew():
+    """Requirement extraction and candidate scoring, for ranking many resumes against one job"""
+
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/recruiter_tasks.yaml'
+
+    def __init__(self, llm_model: str, resume_markdown: str = None, run_id: str = None,
+                 checkpoint: bool = True, routes_file: str = None) -> None:
+        """
+        Crews of a single task run by the job analyzer.
+
+        ``requirements_crew`` extracts the requirements of the job once;
+        ``scoring_crew`` scores the candidate whose ``resume_markdown`` is
+        given against them, searching the resume rather than reading it all.
+        Both tasks are checkpointed, so a job or a candidate seen before is
+        not sent to the LLM again.
+        """
+        self.run_id = run_id or new_run_id()
+        self.resume_search_tool = ResumeSearchTool(markdown=resume_markdown) if resume_markdown is not None else None
+        self.resume_hash = hashlib.sha256(resume_markdown.encode()).hexdigest() if resume_markdown is not None else ''
+        self.checkpoint = checkpoint
+        self.router = ModelRouter.from_file(llm_model, routes_file or DEFAULT_ROUTES_FILE)
+
+    @agent
+    def job_analyzer(self) -> Agent:
+        # Scoring works from the extracted requirements, so only extraction reads the posting.
+        tools = [self.resume_search_tool] if self.resume_search_tool is not None else [CachedScrapeWebsiteTool()]
+        return Agent(
+            config=self.agents_config['job_analyzer'],
+            # Many of these crews run at once; their interleaved logs would be unreadable.
+            verbose=False,
+            tools=tools,
+            llm=self.router.llm('job_analyzer')
+        )
+
+    @task
+    def extract_requirements_task(self) -> Task:
+        return CheckpointedTask(
+            config=self.tasks_config['extract_requirements_task'],
+            checkpoint=self.checkpoint,
+            output_file=output_path('job_requirements.json', self.run_id),
+            output_pydantic=JobRequirements
+        )
+
+    @task
+    def score_candidate_task(self) -> Task:
+        return CheckpointedTask(
+            config=self.tasks_config['score_candidate_task'],
+            checkpoint_inputs={'resume': self.resume_hash},
+            checkpoint=self.checkpoint,
+            output_pydantic=JobMatchScore
+        )
+
+    def requirements_crew(self) -> Crew:
+        return Crew(agents=[self.job_analyzer()], tasks=[self.extract_requirements_task()],
+                    process=Process.sequential, verbose=False)
+
+    def scoring_crew(self) -> Crew:
+        return Crew(agents=[self.job_analyzer()], tasks=[self.score_candidate_task()],
+                    process=Process.sequential, verbose=False)
@@ -0,0 +1,171 @@
+import hashlib
+import io
+import os
+import tempfile
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+from typing import List, Optional, Union
+
+from .cache import DiskCache, DEFAULT_CACHE_DIR
+
+
+# Bump whenever the conversion changes its output, so stale conversions are not served.
+CONVERTER_VERSION = '2'
+
+# PDFs with at least this many pages are split over a process pool.
+PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 8))
+
+# Lines set larger than the page's body text become headings: '#' from the
+# first scale up (usually the name), '##' from the second (section titles).
+HEADING_SCALES = ((1.15, '#'), (1.05, '##'))
+BULLETS = '•●▪◦‣∙-*–'
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_resume_cache = None
+
+
+def get_resume_cache() -> DiskCache:
+    """Process-wide cache of converted resumes, keyed by content hash."""
+    global _resume_cache
+    if _resume_cache is None:
+        _resume_cache = DiskCache(
+            os.path.join(DEFAULT_CACHE_DIR, 'resume_md.sqlite'),
+            max_bytes=int(os.environ.get('RESUME_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        )
+    return _resume_cache
+
+
+def resume_cache_key(data: Buffer) -> str:
+    digest = hashlib.sha256(CONVERTER_VERSION.encode() + b'\0')
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _page_markdown(page) -> str:
+    """
+    Text of a pdfplumber page, with larger lines as headings and bullet
+    glyphs (including symbol-font glyphs in the private use area) as list
+    items.
+    """
+    lines = [line for line in page.extract_text_lines() if line['text'].strip()]
+    sizes = [char['size'] for line in lines for char in line['chars']]
+    body = median(sizes) if sizes else 0
+    out = []
+    for line in lines:
+        text = line['text'].strip()
+        size = max(char['size'] for char in line['chars'])
+        marker = next((m for scale, m in HEADING_SCALES if body and size >= body * scale), None)
+        if marker and len(text) <= 80:
+            out.append(f'\n{marker} {text}\n')
+        elif len(text) > 1 and (text[0] in BULLETS or unicodedata.category(text[0]) == 'Co'):
+            out.append('- ' + text[1:].strip())
+        else:
+            out.append(text)
+    return '\n'.join(out).strip()
+
+
+def _pages_markdown(data: bytes, start: int, stop: int) -> List[str]:
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [_page_markdown(page) for page in pdf.pages[start:stop]]
+
+
+def pdf_to_markdown(data: Buffer, workers: Optional[int] = None) -> str:
+    """
+    Convert PDF bytes to markdown, page by page.
+
+    Long PDFs (``PARALLEL_MIN_PAGES`` pages or more) are split into one
+    contiguous page range per worker process, ``workers`` defaulting to the
+    CPU count.
+    """
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        page_count = len(pdf.pages)
+        workers = min(workers or os.cpu_count() or 1, page_count)
+        if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+            pages = [_page_markdown(page) for page in pdf.pages]
+        else:
+            pages = None
+    if pages is None:
+        data = bytes(data)
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            ranges = executor.map(_pages_markdown, [data] * workers, bounds[:-1], bounds[1:])
+            pages = [page for pages_of_range in ranges for page in pages_of_range]
+    return '\n\n'.join(page for page in pages if page) + '\n'
+
+
+def resume_to_markdown(data: Buffer, file_name: str = '') -> str:
+    """
+    Convert a resume held in memory (bytes or any buffer) to markdown.
+
+    PDFs are converted with pdfplumber, markdown and plain text are decoded
+    as they are; other formats raise ValueError (``convert_resume`` handles
+    them through file2md). Conversions are cached by a hash of the bytes and
+    the converter version, so the same CV uploaded again is not parsed a
+    second time.
+    """
+    data = memoryview(data)
+    key = resume_cache_key(data)
+    cache = get_resume_cache()
+    markdown = cache.get(key)
+    if markdown is not None:
+        return markdown
+    if data[:5] == b'%PDF-':
+        markdown = pdf_to_markdown(data)
+    else:
+        try:
+            markdown = str(data, 'utf-8')
+        except UnicodeDecodeError:
+            raise ValueError(f"Cannot convert {file_name or 'the resume'}: only PDF, markdown and text are supported")
+    cache.set(key, markdown)
+    return markdown
+
+
+def convert_resume(data: Buffer, file_name: str = '') -> str:
+    """
+    Convert a resume in any format to markdown.
+
+    PDFs, markdown and text are converted in memory (``resume_to_markdown``);
+    other formats, such as Word documents, are written to a temporary file
+    named like ``file_name`` and go through file2md. Both are cached by
+    content hash.
+    """
+    try:
+        return resume_to_markdown(data, file_name)
+    except ValueError:
+        pass
+    key = resume_cache_key(data)
+    cache = get_resume_cache()
+    markdown = cache.get(key)
+    if markdown is None:
+        from utils.convert2md import file2md
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, os.path.basename(file_name) or 'resume')
+            with open(file_path, 'wb') as f:
+                f.write(data)
+            with open(file2md(file_path), 'r') as f:
+                markdown = f.read()
+        cache.set(key, markdown)
+    return markdown
+
+
+def load_resume_markdown(file_path: str) -> str:
+    """
+    Convert a resume file to markdown and return the path of the markdown file.
+
+    The file is converted with ``convert_resume``; the markdown is written to
+    the cache directory under the content hash.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    markdown = convert_resume(data, os.path.basename(file_path))
+
+    md_file_path = os.path.join(DEFAULT_CACHE_DIR, 'resume_md', f'{resume_cache_key(data)}.md')
+    if not os.path.isfile(md_file_path):
+        os.makedirs(os.path.dirname(md_file_path), exist_ok=True)
+        with open(md_file_path, 'w') as f:
+            f.write(markdown)
+    return md_file_path
@@ -0,0 +1,362 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+@dataclass
+class CallRecord:
+    """One measured unit of work: a task, an LLM call or a tool call."""
+    kind: str
+    name: str
+    task: str
+    agent: str
+    started_at: str
+    wall_time: float
+    queue_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    cost: float = 0.0
+    model: Optional[str] = None
+    error: Optional[str] = None
+    output_repair: Optional[str] = None
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost from litellm's price table, 0 for unknown or local models."""
+    if not model or not (prompt_tokens or completion_tokens):
+        return 0.0
+    try:
+        import litellm
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return 0.0
+
+
+def _token_counts(agent) -> tuple:
+    token_process = getattr(agent, '_token_process', None)
+    if token_process is None:
+        return 0, 0
+    summary = token_process.get_summary()
+    return summary.prompt_tokens, summary.completion_tokens
+
+
+# Events are emitted on the thread that executes the task, so the task a
+# given LLM or tool call belongs to is tracked per thread.
+_current = threading.local()
+_active: List['RunMetrics'] = []
+_active_lock = threading.Lock()
+_handlers_registered = False
+
+
+def _owner(task) -> Optional['RunMetrics']:
+    with _active_lock:
+        for metrics in _active:
+            if id(task) in metrics.task_ids:
+                return metrics
+    return None
+
+
+def _register_handlers() -> None:
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    _handlers_registered = True
+    # Imported here so that reading metrics files does not load crewAI.
+    try:
+        from crewai.events import (
+            crewai_event_bus,
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+            LLMCallStartedEvent,
+            TaskCompletedEvent,
+            TaskFailedEvent,
+            TaskStartedEvent,
+            ToolUsageErrorEvent,
+            ToolUsageFinishedEvent,
+            ToolUsageStartedEvent,
+        )
+    except ImportError:  # crewai releases before the events package was split out
+        from crewai.utilities.events import (
+            crewai_event_bus,
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+            LLMCallStartedEvent,
+            TaskCompletedEvent,
+            TaskFailedEvent,
+            TaskStartedEvent,
+            ToolUsageErrorEvent,
+            ToolUsageFinishedEvent,
+            ToolUsageStartedEvent,
+        )
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def on_task_started(source, event):
+        task = getattr(event, 'task', None) or source
+        _current.task = task
+        metrics = _owner(task)
+        if metrics:
+            metrics._task_started(task)
+
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def on_task_completed(source, event):
+        task = getattr(event, 'task', None) or source
+        metrics = _owner(task)
+        if metrics:
+            metrics._task_finished(task)
+
+    @crewai_event_bus.on(TaskFailedEvent)
+    def on_task_failed(source, event):
+        task = getattr(event, 'task', None) or source
+        metrics = _owner(task)
+        if metrics:
+            metrics._task_finished(task, error=str(event.error))
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def on_llm_started(source, event):
+        task = getattr(_current, 'task', None)
+        metrics = _owner(task)
+        if metrics:
+            metrics._llm_started(task)
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def on_llm_completed(source, event):
+        task = getattr(_current, 'task', None)
+        metrics = _owner(task)
+        if metrics:
+            metrics._llm_finished(task, getattr(event, 'model', None) or getattr(source, 'model', None))
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def on_llm_failed(source, event):
+        task = getattr(_current, 'task', None)
+        metrics = _owner(task)
+        if metrics:
+            metrics._llm_finished(task, getattr(source, 'model', None), error=str(event.error))
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def on_tool_started(source, event):
+        task = getattr(_current, 'task', None)
+        metrics = _owner(task)
+        if metrics:
+            metrics._tool_started(task, event.tool_name)
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def on_tool_finished(source, event):
+        task = getattr(_current, 'task', None)
+        metrics = _owner(task)
+        if metrics:
+            metrics._tool_finished(task, event)
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def on_tool_error(source, event):
+        task = getattr(_current, 'task', None)
+        metrics = _owner(task)
+        if metrics:
+            metrics._tool_finished(task, event, error=str(event.error))
+
+
+def track_current_task() -> None:
+    """Start following which task each thread runs, for ``current_task``."""
+    _register_handlers()
+
+
+def current_task():
+    """
+    The task running on this thread, for crewAI releases whose LLM calls do
+    not say which task they belong to (``from_task``). Needs
+    ``track_current_task`` to have been called before the task started.
+    """
+    return getattr(_current, 'task', None)
+
+
+class RunMetrics:
+    """
+    Collects latency, token, retry and cost figures for one crew run.
+
+    Use as a context manager around the kickoff. Every task, LLM call and
+    tool call of the crew becomes a ``CallRecord``; on exit the records are
+    written as JSON lines to ``metrics_file``. Queue time is the time a task
+    spent waiting after all of its context tasks had finished.
+    """
+
+    def __init__(self, crew, metrics_file: Optional[str] = None):
+        self.crew = crew
+        self.task_ids = {id(task) for task in crew.tasks}
+        self.metrics_file = metrics_file
+        self.records: List[CallRecord] = []
+        self._lock = threading.Lock()
+        self._origin = None
+        self._finished_at: Dict[int, float] = {}
+        self._task_state: Dict[int, dict] = {}
+        self._llm_state: Dict[int, dict] = {}
+        self._tool_state: Dict[tuple, dict] = {}
+
+    def __enter__(self) -> 'RunMetrics':
+        _register_handlers()
+        self._origin = time.perf_counter()
+        with _active_lock:
+            _active.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with _active_lock:
+            _active.remove(self)
+        if self.metrics_file:
+            self.write_jsonl(self.metrics_file)
+
+    # Event callbacks
+
+    def _task_started(self, task) -> None:
+        context = task.context if isinstance(task.context, list) else []
+        ready_at = max([self._finished_at.get(id(dep), self._origin) for dep in context] or [self._origin])
+        now = time.perf_counter()
+        self._task_state[id(task)] = {
+            'start': now,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'queue_time': max(0.0, now - ready_at),
+        }
+
+    def _task_finished(self, task, error: Optional[str] = None) -> None:
+        state = self._task_state.pop(id(task), None)
+        if state is None:
+            return
+        now = time.perf_counter()
+        self._finished_at[id(task)] = now
+        with self._lock:
+            calls = [r for r in self.records if r.task == task.name and r.kind != 'task']
+            self.records.append(CallRecord(
+                kind='task',
+                name=task.name,
+                task=task.name,
+                agent=task.agent.role if task.agent else 'None',
+                started_at=state['started_at'],
+                wall_time=round(now - state['start'], 3),
+                queue_time=round(state['queue_time'], 3),
+                prompt_tokens=sum(r.prompt_tokens for r in calls),
+                completion_tokens=sum(r.completion_tokens for r in calls),
+                retries=sum(r.retries for r in calls),
+                cost=sum(r.cost for r in calls),
+                error=error,
+                output_repair=getattr(task, 'output_repair', None),
+            ))
+
+    def _llm_started(self, task) -> None:
+        self._llm_state[threading.get_ident()] = {
+            'start': time.perf_counter(),
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'tokens': _token_counts(task.agent),
+        }
+
+    def _llm_finished(self, task, model: Optional[str], error: Optional[str] = None) -> None:
+        state = self._llm_state.pop(threading.get_ident(), None)
+        if state is None:
+            return
+        prompt_tokens, completion_tokens = _token_counts(task.agent)
+        prompt_tokens -= state['tokens'][0]
+        completion_tokens -= state['tokens'][1]
+        with self._lock:
+            self.records.append(CallRecord(
+                kind='llm',
+                name=model or 'llm',
+                task=task.name,
+                agent=task.agent.role if task.agent else 'None',
+                started_at=state['started_at'],
+                wall_time=round(time.perf_counter() - state['start'], 3),
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                retries=1 if error else 0,
+                cost=estimate_cost(model, prompt_tokens, completion_tokens),
+                model=model,
+                error=error,
+            ))
+
+    def _tool_started(self, task, tool_name: str) -> None:
+        self._tool_state[(threading.get_ident(), tool_name)] = {
+            'start': time.perf_counter(),
+            'started_at': datetime.now(timezone.utc).isoformat(),
+        }
+
+    def _tool_finished(self, task, event, error: Optional[str] = None) -> None:
+        state = self._tool_state.pop((threading.get_ident(), event.tool_name), None)
+        if state is None:
+            return
+        attempts = getattr(event, 'run_attempts', None) or 1
+        with self._lock:
+            self.records.append(CallRecord(
+                kind='tool',
+                name=event.tool_name,
+                task=task.name,
+                agent=task.agent.role if task.agent else 'None',
+                started_at=state['started_at'],
+                wall_time=round(time.perf_counter() - state['start'], 3),
+                retries=attempts - 1 + (1 if error else 0),
+                error=error,
+            ))
+
+    # Reporting
+
+    def write_jsonl(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            for record in self.records:
+                f.write(json.dumps(asdict(record)) + '\n')
+
+    def summary(self) -> List[dict]:
+        return summarize_metrics([asdict(r) for r in self.records])
+
+    def summary_table(self) -> str:
+        return format_summary(self.summary())
+
+
+def load_metrics(path: str) -> List[dict]:
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_metrics(records: List[dict]) -> List[dict]:
+    """One row per task with its agent, timings, call counts, tokens and cost."""
+    rows = []
+    for record in records:
+        if record['kind'] != 'task':
+            continue
+        calls = [r for r in records if r['task'] == record['task'] and r['kind'] != 'task']
+        rows.append({
+            'task': record['task'],
+            'agent': record['agent'],
+            'wall_time': record['wall_time'],
+            'queue_time': record['queue_time'],
+            'llm_calls': sum(1 for r in calls if r['kind'] == 'llm'),
+            'llm_time': round(sum(r['wall_time'] for r in calls if r['kind'] == 'llm'), 3),
+            'tool_calls': sum(1 for r in calls if r['kind'] == 'tool'),
+            'tool_time': round(sum(r['wall_time'] for r in calls if r['kind'] == 'tool'), 3),
+            'prompt_tokens': record['prompt_tokens'],
+            'completion_tokens': record['completion_tokens'],
+            'retries': record['retries'],
+            'repaired': int(record.get('output_repair') == 'repaired'),
+            'repair_failed': int(record.get('output_repair') == 'failed'),
+            'cost': round(record['cost'], 4),
+        })
+    return rows
+
+
+def format_summary(rows: List[dict]) -> str:
+    """Render summary rows as a fixed-width text table with a totals line."""
+    if not rows:
+        return 'No task metrics recorded.'
+    totals = {key: round(sum(row[key] for row in rows), 4)
+              for key in rows[0] if key not in ('task', 'agent')}
+    rows = rows + [{'task': 'TOTAL', 'agent': '', **totals}]
+    headers = list(rows[0])
+    widths = {h: max(len(h), *(len(str(row[h])) for row in rows)) for h in headers}
+    lines = ['  '.join(h.ljust(widths[h]) for h in headers)]
+    lines.append('  '.join('-' * widths[h] for h in headers))
+    for row in rows:
+        lines.append('  '.join(str(row[h]).ljust(widths[h]) for h in headers))
+    return '\n'.join(lines)
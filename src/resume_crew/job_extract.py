@@ -0,0 +1,279 @@
+import html as html_lib
+import json
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup, Tag
+
+from .tokens import count_tokens
+
+
+# Extractions shorter than this are distrusted and the whole page is used instead.
+MIN_CHARS = 200
+
+# Never part of a job description.
+BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'template', 'nav', 'header', 'footer', 'aside',
+                    'form', 'iframe', 'svg', 'button', 'select', 'input', 'dialog')
+BLOCK_TAGS = ('p', 'div', 'section', 'article', 'main', 'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'table', 'tr',
+              'pre', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Class and id patterns, as in readability: unlikely candidates are dropped
+# unless they also look like content, likely ones get a score bonus.
+UNLIKELY = re.compile(r'cookie|consent|gdpr|banner|navbar|menu|breadcrumb|footer|sidebar|social|share|'
+                      r'newsletter|subscribe|related|similar|recommend|other-jobs|more-jobs|modal|popup|'
+                      r'skip-link|login|signup', re.I)
+LIKELY = re.compile(r'job|posting|description|vacanc|career|content|article|main|details', re.I)
+CLASS_WEIGHT = 25
+
+
+@dataclass(frozen=True)
+class Layout:
+    """CSS selectors of a known applicant tracking system's job page."""
+    name: str
+    hosts: Pattern
+    marker: str
+    title: Tuple[str, ...]
+    body: Tuple[str, ...]
+
+
+LAYOUTS = (
+    Layout(
+        name='workday',
+        hosts=re.compile(r'myworkdayjobs\.com$|myworkdaysite\.com$'),
+        marker='[data-automation-id="jobPostingDescription"]',
+        title=('[data-automation-id="jobPostingHeader"]',),
+        body=('[data-automation-id="locations"]', '[data-automation-id="time"]',
+              '[data-automation-id="jobPostingDescription"]'),
+    ),
+    Layout(
+        name='greenhouse',
+        hosts=re.compile(r'greenhouse\.io$'),
+        marker='#app_body .app-title, .job__description',
+        title=('.app-title', '.job__title h1'),
+        body=('#header .location', '.job__location', '#content', '.job__description'),
+    ),
+    Layout(
+        name='lever',
+        hosts=re.compile(r'lever\.co$'),
+        marker='.posting-page .posting-headline',
+        title=('.posting-headline h2',),
+        body=('.posting-headline .posting-categories',
+              '.posting-page .section-wrapper .section:not(.last-section-apply)'),
+    ),
+)
+
+
+@dataclass
+class JobPosting:
+    """The job description of a page, how it was found and its size before and after."""
+    text: str
+    layout: str
+    tokens_before: int
+    tokens_after: int
+
+
+def page_text(html: str) -> str:
+    """All text of a page, whitespace-normalized; what the agent saw before extraction."""
+    text = BeautifulSoup(html, 'html.parser').get_text(' ')
+    text = re.sub('[ \t]+', ' ', text)
+    return re.sub('\\s+\n\\s+', '\n', text).strip()
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or '') if url else ''
+
+
+def element_text(element: Tag) -> str:
+    """
+    Text of ``element`` with one line per block, list items as ``- `` bullets
+    and runs of whitespace collapsed. Modifies the element.
+    """
+    for br in element.find_all('br'):
+        br.replace_with('\n')
+    for li in element.find_all('li'):
+        li.insert(0, '\n- ')
+    for block in element.find_all(BLOCK_TAGS):
+        block.insert(0, '\n')
+        block.append('\n')
+    lines = []
+    for line in element.get_text().splitlines():
+        line = re.sub(r'\s+', ' ', line).strip()
+        if not line:
+            continue
+        if lines and lines[-1] == '-':
+            lines[-1] = '- ' + line
+        else:
+            lines.append(line)
+    return '\n'.join(line for line in lines if line != '-')
+
+
+def _title(soup: BeautifulSoup, selectors) -> str:
+    for selector in selectors:
+        found = soup.select_one(selector)
+        if found is not None and found.get_text(strip=True):
+            return re.sub(r'\s+', ' ', found.get_text(' ')).strip()
+    return ''
+
+
+def _with_title(title: str, text: str) -> str:
+    if title and not text.startswith(title):
+        return f'{title}\n{text}'
+    return text
+
+
+def extract_layout(soup: BeautifulSoup, url: str = '') -> Optional[Tuple[str, str]]:
+    """Job text and layout name of a Workday, Greenhouse or Lever page, if the page is one."""
+    host = _host(url)
+    for layout in LAYOUTS:
+        if not layout.hosts.search(host) and soup.select_one(layout.marker) is None:
+            continue
+        parts = []
+        for selector in layout.body:
+            for element in soup.select(selector):
+                # Skip elements nested in an earlier match.
+                if any(element in part.parents for part in parts):
+                    continue
+                parts.append(element)
+        if not parts:
+            continue
+        title = _title(soup, layout.title)
+        for part in parts:
+            for unwanted in part.find_all(BOILERPLATE_TAGS):
+                unwanted.decompose()
+        text = '\n'.join(filter(None, (element_text(part) for part in parts)))
+        return _with_title(title, text), layout.name
+    return None
+
+
+def _json_ld_postings(soup: BeautifulSoup) -> List[dict]:
+    postings = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        postings.extend(item for item in items if isinstance(item, dict) and item.get('@type') == 'JobPosting')
+    return postings
+
+
+def extract_json_ld(soup: BeautifulSoup) -> Optional[str]:
+    """Job text from schema.org ``JobPosting`` structured data, which many career sites embed."""
+    for posting in _json_ld_postings(soup):
+        description = posting.get('description')
+        if not isinstance(description, str):
+            continue
+        if '&lt;' in description:
+            description = html_lib.unescape(description)
+        body = BeautifulSoup(f'<div>{description}</div>', 'html.parser').div
+        text = element_text(body)
+        if len(text) < MIN_CHARS:
+            continue
+        details = []
+        location = posting.get('jobLocation')
+        for place in location if isinstance(location, list) else [location]:
+            address = place.get('address') if isinstance(place, dict) else None
+            if isinstance(address, dict):
+                details.append(', '.join(str(address[k]) for k in ('addressLocality', 'addressCountry') if address.get(k)))
+        if posting.get('employmentType'):
+            details.append(str(posting['employmentType']))
+        organization = posting.get('hiringOrganization')
+        if isinstance(organization, dict) and organization.get('name'):
+            details.append(str(organization['name']))
+        header = '\n'.join(filter(None, [str(posting.get('title', '')).strip()] + details))
+        return f'{header}\n{text}' if header else text
+    return None
+
+
+def _class_weight(element: Tag) -> int:
+    names = ' '.join(element.get('class') or []) + ' ' + (element.get('id') or '')
+    weight = 0
+    if LIKELY.search(names):
+        weight += CLASS_WEIGHT
+    if UNLIKELY.search(names):
+        weight -= CLASS_WEIGHT
+    return weight
+
+
+def _link_density(element: Tag) -> float:
+    length = len(element.get_text(strip=True))
+    if not length:
+        return 1.0
+    return sum(len(a.get_text(strip=True)) for a in element.find_all('a')) / length
+
+
+def extract_dense(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Readability-style extraction: the element whose paragraphs carry the most text.
+
+    Boilerplate tags and elements whose class or id looks like navigation,
+    cookie banners or related jobs are removed. Each paragraph or list item
+    of at least 25 characters scores one point, one per comma and one per
+    100 characters (at most three); the score goes to its container and half
+    of it to the container's parent. Containers are weighted by class and id
+    and by the share of their text that is not links, and the best one wins.
+    """
+    body = soup.body or soup
+    for unwanted in body.find_all(BOILERPLATE_TAGS):
+        unwanted.decompose()
+    for element in body.find_all(True):
+        if element.decomposed or element.name in ('html', 'body', 'main', 'article'):
+            continue
+        names = ' '.join(element.get('class') or []) + ' ' + (element.get('id') or '')
+        if UNLIKELY.search(names) and not LIKELY.search(names):
+            element.decompose()
+
+    title = _title(body, ('h1',))
+    scores = {}
+    for node in body.find_all(('p', 'li', 'pre', 'td', 'dd')):
+        text = node.get_text(' ', strip=True)
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        container = node.parent
+        if container is not None and container.name in ('ul', 'ol', 'dl'):
+            container = container.parent
+        for element, share in ((container, 1.0), (container.parent if container is not None else None, 0.5)):
+            if element is None or not isinstance(element, Tag):
+                continue
+            if id(element) not in scores:
+                scores[id(element)] = [element, _class_weight(element)]
+            scores[id(element)][1] += score * share
+    if not scores:
+        return None
+    best = max(scores.values(), key=lambda item: item[1] * (1 - _link_density(item[0])))[0]
+    return _with_title(title, element_text(best))
+
+
+def extract_job_posting(html: str, url: str = '') -> JobPosting:
+    """
+    Isolate the job description of a scraped page.
+
+    Known applicant tracking system layouts (Workday, Greenhouse, Lever) are
+    read with their own selectors, then schema.org ``JobPosting`` data is
+    tried, then readability-style text density. When every strategy comes
+    back with less than ``MIN_CHARS`` characters the whole page text is kept,
+    so a page the heuristics do not understand is never lost.
+    """
+    before = page_text(html)
+    text, layout = None, 'full'
+    for name, strategy in (
+            ('ats', lambda soup: extract_layout(soup, url)),
+            ('json-ld', lambda soup: extract_json_ld(soup)),
+            ('density', lambda soup: extract_dense(soup))):
+        result = strategy(BeautifulSoup(html, 'html.parser'))
+        if isinstance(result, tuple):
+            result, name = result
+        if result and len(result) >= MIN_CHARS:
+            text, layout = result, name
+            break
+    if text is None:
+        text = before
+    return JobPosting(
+        text=text,
+        layout=layout,
+        tokens_before=count_tokens(before),
+        tokens_after=count_tokens(text),
+    )
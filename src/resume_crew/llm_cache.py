@@ -0,0 +1,105 @@
+import hashlib
+import inspect
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import LLM
+
+try:
+    from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+except ImportError:  # crewai releases before the events package was split out
+    from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+
+from .cache import DiskCache, DEFAULT_CACHE_DIR
+
+
+# Keyword arguments of LLM.call in the installed crewAI; older releases take
+# no from_task/from_agent.
+_CALL_PARAMS = frozenset(inspect.signature(LLM.call).parameters)
+
+_response_cache = None
+
+
+def get_response_cache() -> DiskCache:
+    """Process-wide SQLite store of deterministic LLM responses."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = DiskCache(
+            os.path.join(DEFAULT_CACHE_DIR, 'llm_responses.sqlite'),
+            max_bytes=int(os.environ.get('LLM_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+        )
+    return _response_cache
+
+
+class CachedLLM(LLM):
+    """
+    LLM that replays previous responses for identical temperature-0 calls.
+
+    The cache key covers the model, the sampling parameters, the tool
+    schemas and the full message list. Calls are passed straight through
+    when the temperature is not exactly 0, or when the LLM is allowed to
+    execute functions, since those responses are not reproducible. Setting
+    ``RESUME_CREW_LLM_CACHE=0`` disables the cache entirely. A streaming
+    LLM emits a replayed response as a single chunk.
+    """
+
+    def __init__(self, model: str, cache: Optional[DiskCache] = None, **kwargs):
+        super().__init__(model, **kwargs)
+        self.cache = cache
+        # Pooled instances are shared by concurrent runs.
+        self._local = threading.local()
+
+    @property
+    def last_call_cached(self) -> bool:
+        """Whether this thread's latest call was answered from the cache."""
+        return getattr(self._local, 'cached', False)
+
+    @property
+    def cacheable(self) -> bool:
+        if os.environ.get('RESUME_CREW_LLM_CACHE', '1') == '0':
+            return False
+        return self.temperature == 0
+
+    def cache_key(self, messages: Union[str, List[Dict[str, str]]], tools: Optional[List[dict]] = None) -> str:
+        response_format = self.response_format
+        if isinstance(response_format, type):
+            response_format = response_format.model_json_schema()
+        params = {
+            'model': self.model,
+            'temperature': self.temperature,
+            'top_p': self.top_p,
+            'n': self.n,
+            'stop': self.stop,
+            'max_tokens': self.max_tokens or self.max_completion_tokens,
+            'seed': self.seed,
+            'response_format': response_format,
+            'reasoning_effort': getattr(self, 'reasoning_effort', None),
+            # keep_alive only controls how long Ollama keeps the model loaded.
+            'additional_params': {k: v for k, v in self.additional_params.items() if k != 'keep_alive'},
+            'tools': tools,
+        }
+        payload = json.dumps([params, messages], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs) -> Any:
+        self._local.cached = False
+        origin = {k: kwargs.get(k) for k in ('from_task', 'from_agent') if k in LLMStreamChunkEvent.model_fields}
+        kwargs = {k: v for k, v in kwargs.items() if k in _CALL_PARAMS}
+        if not self.cacheable or available_functions:
+            return super().call(messages, tools=tools, callbacks=callbacks,
+                                available_functions=available_functions, **kwargs)
+
+        cache = self.cache or get_response_cache()
+        key = self.cache_key(messages, tools)
+        response = cache.get(key)
+        if response is None:
+            response = super().call(messages, tools=tools, callbacks=callbacks, **kwargs)
+            if isinstance(response, str):
+                cache.set(key, response)
+        else:
+            self._local.cached = True
+            if self.stream:
+                crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=response, **origin))
+        return response
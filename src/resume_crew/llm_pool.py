@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+import litellm
+
+
+# How long Ollama keeps a model loaded after the last request (Ollama's own default is 5m).
+OLLAMA_KEEP_ALIVE = os.environ.get('OLLAMA_KEEP_ALIVE', '1h')
+OLLAMA_PREFIXES = ('ollama/', 'ollama_chat/')
+
+_pool: Dict[str, Any] = {}
+_pool_lock = threading.Lock()
+_http_configured = False
+_warmed = set()
+
+
+def pooling_enabled() -> bool:
+    return os.environ.get('RESUME_CREW_LLM_POOL', '1') != '0'
+
+
+def configure_http_pool() -> None:
+    """
+    Share one keep-alive connection pool between all OpenAI-compatible clients.
+
+    litellm creates a client per model and endpoint, each with its own
+    connections; with a shared ``httpx.Client`` the connections opened by
+    one run are reused by the next.
+    """
+    global _http_configured
+    with _pool_lock:
+        if _http_configured or litellm.client_session is not None:
+            return
+        _http_configured = True
+        litellm.client_session = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=int(os.environ.get('LLM_POOL_MAX_CONNECTIONS', 100)),
+                max_keepalive_connections=int(os.environ.get('LLM_POOL_MAX_KEEPALIVE', 20)),
+                keepalive_expiry=float(os.environ.get('LLM_POOL_KEEPALIVE_EXPIRY', 300)),
+            ),
+            follow_redirects=True,
+        )
+
+
+def is_ollama(model: str) -> bool:
+    return model.startswith(OLLAMA_PREFIXES)
+
+
+def ollama_params(model: str) -> dict:
+    """Extra completion parameters for ``model``: a keep-alive for Ollama models."""
+    return {'keep_alive': OLLAMA_KEEP_ALIVE} if is_ollama(model) else {}
+
+
+def warm_ollama(model: str, api_base: Optional[str] = None) -> None:
+    """
+    Load an Ollama model in the background, once per process.
+
+    An empty generate request makes Ollama load the model and keep it for
+    ``OLLAMA_KEEP_ALIVE``, so the first run does not pay for the load
+    either.
+    """
+    key = (model, api_base)
+    with _pool_lock:
+        if key in _warmed:
+            return
+        _warmed.add(key)
+
+    def load():
+        try:
+            import ollama
+            client = ollama.Client(host=api_base or os.environ.get('OLLAMA_HOST'))
+            client.generate(model=model.split('/', 1)[1], prompt='', keep_alive=OLLAMA_KEEP_ALIVE)
+        except Exception as e:
+            print(f"Could not preload {model}: {e}")
+
+    threading.Thread(target=load, daemon=True).start()
+
+
+def _key_default(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    return repr(value)
+
+
+def pooled(cls, *args, **kwargs) -> Any:
+    """
+    Process-wide instance of ``cls(*args, **kwargs)``.
+
+    Instances are keyed by class and arguments, so every crew and run asking
+    for the same model with the same parameters gets the same LLM and its
+    warm client. Setting ``RESUME_CREW_LLM_POOL=0`` builds a new instance
+    every time.
+    """
+    if not pooling_enabled():
+        return cls(*args, **kwargs)
+    configure_http_pool()
+    key = json.dumps([cls.__qualname__, args, kwargs], sort_keys=True, default=_key_default)
+    with _pool_lock:
+        instance = _pool.get(key)
+    if instance is None:
+        instance = cls(*args, **kwargs)
+        with _pool_lock:
+            instance = _pool.setdefault(key, instance)
+    return instance
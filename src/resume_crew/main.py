@@ -1,12 +1,18 @@
 #!/usr/bin/env python
 import argparse
+import json
+import os
 import warnings
-from resume_crew.crew import ResumeCrew
+from resume_crew.outputs import OUTPUT_ROOT, output_path
+
+# crewAI, its tools, litellm and the PDF libraries take seconds to import, so
+# they are only imported by the commands that use them.
 
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-def run(job_url=None, company_name=None, resume_file=None, llm_model=None):
+def run(job_url=None, company_name=None, resume_file=None, llm_model=None, parallel=None, run_id=None,
+        step_callback=None, stream_sink=None, fresh=None, resume_data=None):
     """
     Run the resume optimization crew process.
 
@@ -18,7 +24,26 @@ def run(job_url=None, company_name=None, resume_file=None, llm_model=None):
         job_url (str, optional): URL of the job posting. If not provided, uses command-line or default.
         company_name (str, optional): Name of the company. If not provided, uses command-line or default.
         resume_file (str, optional): Path to the resume file. If not provided, uses command-line or default.
+        resume_data (bytes, optional): Contents of the resume (bytes or a memoryview), converted in memory
+            instead of reading resume_file from the input/ directory, which then only names the upload.
         llm_model (str, optional): Name of the LLM model to use. If not provided, uses command-line or default.
+        parallel (bool, optional): Run independent tasks concurrently following the task context graph.
+            Per-task timings are written to task_timings.json in the run's output directory.
+        run_id (str, optional): Identifier of the run. All outputs are written to output/runs/<run_id>/.
+            A new one is generated if not provided.
+        step_callback (callable, optional): Called after every agent step, e.g. to abort a cancelled run.
+        stream_sink (callable, optional): Streams the LLM responses and is called with the run's RunStream
+            before the kickoff, so a UI can show output while it is generated.
+        fresh (bool, optional): Run every task even if a checkpoint with the same inputs exists. By default
+            tasks whose resume, job URL, company name, model, prompt and upstream outputs are unchanged
+            since an earlier run are skipped, so a failed or edited run resumes from the first changed task.
+
+    Agents and tasks run on the models assigned in the routing table (--routes, or the MODEL_ROUTES
+    environment variable), with llm_model as the default; a model whose p95 latency or error rate
+    crosses the table's thresholds is replaced by its fallback.
+
+    Latency, token, retry and cost metrics of every task, LLM call and tool call are written to
+    metrics.jsonl in the run's output directory, and a per-task summary table is printed at the end.
 
     Returns:
         Any: The result of the ResumeCrew pipeline kickoff.
@@ -28,13 +53,119 @@ def run(job_url=None, company_name=None, resume_file=None, llm_model=None):
     parser.add_argument("-c", "--company_name", type=str, help="Company Name", default="ExampleCorp")
     parser.add_argument("-f", "--resume_file", type=str, help="Resume File Path", default="/path/to/default/resume.pdf")
     parser.add_argument("-m", "--llm_model", type=str, help="LLM Model", default="gpt-3.5-turbo")
+    parser.add_argument("-p", "--parallel", action="store_true", help="Run independent tasks concurrently")
+    parser.add_argument("-r", "--run_id", type=str, help="Run ID used to namespace the outputs", default=None)
+    parser.add_argument("--fresh", action="store_true", help="Ignore task checkpoints and run every task")
+    parser.add_argument("--routes", type=str, help="Model routing table, defaults to config/models.yaml", default=None)
     args = parser.parse_args()
+    from resume_crew.crew import ResumeCrew
+    from resume_crew.instrumentation import RunMetrics
+    from resume_crew.scheduler import ParallelScheduler
+    from resume_crew.streaming import RunStream
     inputs = {
         'job_url':  job_url or args.job_url,
         'company_name': company_name or args.company_name
     }
     resume_file = resume_file or args.resume_file
     llm_model = llm_model or args.llm_model
-    return ResumeCrew(resume_file, llm_model).crew().kickoff(inputs=inputs)
+    parallel = args.parallel if parallel is None else parallel
+    fresh = args.fresh if fresh is None else fresh
+    resume_crew = ResumeCrew(resume_file, llm_model, run_id=run_id or args.run_id, stream=stream_sink is not None,
+                             checkpoint=not fresh, routes_file=args.routes, resume_data=resume_data)
+    crew = resume_crew.crew()
+    if step_callback is not None:
+        crew.step_callback = step_callback
+    with RunMetrics(crew, metrics_file=output_path('metrics.jsonl', resume_crew.run_id)) as metrics, \
+            RunStream(crew) as live:
+        if stream_sink is not None:
+            stream_sink(live)
+        if parallel:
+            timings_file = output_path('task_timings.json', resume_crew.run_id)
+            result = ParallelScheduler(crew, timings_file=timings_file).kickoff(inputs=inputs)
+        else:
+            result = crew.kickoff(inputs=inputs)
+    print(metrics.summary_table())
+    return result
+
+def batch():
+    """
+    Run the resume optimization crew for many jobs against one resume.
+
+    Reads a CSV or JSONL file with job_url and company_name per job, runs the crews with
+    a bounded number of workers and writes a results manifest with throughput stats.
+
+    Returns:
+        dict: The batch manifest.
+    """
+    parser = argparse.ArgumentParser(description="Run the resume optimization crew for a list of jobs.")
+    parser.add_argument("jobs_file", type=str, help="CSV or JSONL file with job_url and company_name")
+    parser.add_argument("-f", "--resume_file", type=str, help="Resume File Path", default="/path/to/default/resume.pdf")
+    parser.add_argument("-m", "--llm_model", type=str, help="LLM Model", default="gpt-3.5-turbo")
+    parser.add_argument("-w", "--workers", type=int, help="Number of concurrent crews", default=4)
+    parser.add_argument("-p", "--parallel", action="store_true", help="Run independent tasks concurrently")
+    parser.add_argument("-o", "--manifest_file", type=str, help="Manifest path", default="output/batch_manifest.json")
+    parser.add_argument("--pdf", action="store_true", help="Export every successful run to run_report.pdf")
+    args = parser.parse_args()
+    from resume_crew.batch import run_batch
+    manifest = run_batch(args.jobs_file, args.resume_file, args.llm_model, workers=args.workers,
+                         parallel=args.parallel, manifest_file=args.manifest_file, pdf=args.pdf)
+    print(json.dumps(manifest['stats'], indent=2))
+    return manifest
+
+def recruit():
+    """
+    Rank many resumes against one job posting.
+
+    The job's requirements are extracted once and cached. All resumes are prefiltered locally
+    against them with hashed term vectors, and only the best --top candidates are scored by the
+    LLM, --workers at a time. The ranking and throughput stats are written to ranking.json and
+    ranking.csv in the run's output directory.
+
+    Returns:
+        dict: The ranking manifest.
+    """
+    parser = argparse.ArgumentParser(description="Rank many resumes against one job posting.")
+    parser.add_argument("job_url", type=str, help="Job URL")
+    parser.add_argument("resumes", type=str, nargs="+", help="Resume files, or directories of resumes")
+    parser.add_argument("-m", "--llm_model", type=str, help="LLM Model", default="gpt-3.5-turbo")
+    parser.add_argument("-n", "--top", type=int, help="Candidates scored by the LLM", default=None)
+    parser.add_argument("-w", "--workers", type=int, help="Number of candidates scored concurrently", default=4)
+    parser.add_argument("-r", "--run_id", type=str, help="Run ID used to namespace the outputs", default=None)
+    parser.add_argument("--fresh", action="store_true", help="Ignore task checkpoints and run every task")
+    parser.add_argument("--routes", type=str, help="Model routing table, defaults to config/models.yaml", default=None)
+    args = parser.parse_args()
+    from resume_crew.recruiter import DEFAULT_TOP_N, format_ranking, run_recruiter
+    manifest = run_recruiter(args.job_url, args.resumes, args.llm_model,
+                             top_n=args.top or DEFAULT_TOP_N, workers=args.workers,
+                             checkpoint=not args.fresh, routes_file=args.routes, run_id=args.run_id)
+    print(format_ranking(manifest['ranking'], limit=manifest['top_n']))
+    print(json.dumps(manifest['stats'], indent=2))
+    return manifest
+
+def export_pdf():
+    """
+    Export the outputs of one or more runs to PDF.
+
+    Every run's optimized resume, final report and JSON analyses are rendered into a single
+    run_report.pdf in its output directory. Several runs are rendered in parallel processes.
+
+    Returns:
+        list: Per-run results with the PDF path, page count and render time.
+    """
+    parser = argparse.ArgumentParser(description="Export run outputs to PDF.")
+    parser.add_argument("run_ids", type=str, nargs="*", help="Run IDs, or none for the shared output directory")
+    parser.add_argument("-a", "--all", action="store_true", help="Export every run under output/runs")
+    parser.add_argument("-w", "--workers", type=int, help="Number of processes, defaults to the CPU count", default=None)
+    args = parser.parse_args()
+    from resume_crew.pdf_export import export_runs
+    run_ids = args.run_ids
+    if args.all:
+        runs_dir = os.path.join(OUTPUT_ROOT, 'runs')
+        run_ids = sorted(os.listdir(runs_dir)) if os.path.isdir(runs_dir) else []
+    results = export_runs(run_ids or [None], workers=args.workers)
+    for result in results:
+        print(json.dumps(result))
+    return results
+
 if __name__ == "__main__":
     run()
@@ -1,7 +1,9 @@
 import json
 from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing_extensions import Annotated
+from .outputs import output_path
+from .scoring import CATEGORIES, score_matches
 
 
 class SkillScore(BaseModel):
@@ -10,6 +12,10 @@ class SkillScore(BaseModel):
     match_level: Annotated[float, Field(ge=0, le=1, description="How well the candidate's experience matches (0-1)")]
     years_experience: Optional[float] = Field(description="Years of experience with this skill", default=None)
     context_score: Annotated[float, Field(ge=0, le=1, description="How relevant the skill usage context is to the job requirements", default=0.5)]
+    category: str = Field(
+        description="Scoring category: technical_skills, soft_skills, experience, education or industry",
+        default="technical_skills"
+    )
     def to_markdown(self):
         """
         Generates a markdown string representation of the SkillScore model.
@@ -17,6 +23,7 @@ class SkillScore(BaseModel):
         """
         markdown = f"""
         **Skill:** {self.skill_name}
+        **Category:** {self.category}
         **Required:** {'Yes' if self.required else 'No'}
         **Match Level:** {self.match_level:.2f}
         **Years Experience:** {self.years_experience if self.years_experience is not None else 'N/A'}
@@ -24,13 +31,24 @@ class SkillScore(BaseModel):
         """.strip()
         return markdown
 
+def _percent(value: Optional[float]) -> str:
+    """A score as a percentage, or N/A for a category without skills."""
+    return 'N/A' if value is None else f'{value:.2f}%'
+
+
 class JobMatchScore(BaseModel):
-    overall_match: Annotated[float, Field(ge=0, le=100, description="Overall match percentage (0-100)")]
-    technical_skills_match: Annotated[float, Field(ge=0, le=100, description="Technical skills match percentage")]
-    soft_skills_match: Annotated[float, Field(ge=0, le=100, description="Soft skills match percentage")]
-    experience_match: Annotated[float, Field(ge=0, le=100, description="Experience level match percentage")]
-    education_match: Annotated[float, Field(ge=0, le=100, description="Education requirements match percentage")]
-    industry_match: Annotated[float, Field(ge=0, le=100, description="Industry experience match percentage")]
+    """
+    Candidate fit for a job. The percentages are computed locally from
+    ``skill_details`` and ``scoring_factors`` (see ``scoring.py``), replacing
+    any values supplied by the model. Categories without skills are None
+    and left out of ``overall_match``.
+    """
+    overall_match: Annotated[float, Field(ge=0, le=100, description="Overall match percentage (0-100), computed locally", default=0)]
+    technical_skills_match: Annotated[Optional[float], Field(ge=0, le=100, description="Technical skills match percentage, computed locally; None without skills in the category", default=None)]
+    soft_skills_match: Annotated[Optional[float], Field(ge=0, le=100, description="Soft skills match percentage, computed locally; None without skills in the category", default=None)]
+    experience_match: Annotated[Optional[float], Field(ge=0, le=100, description="Experience level match percentage, computed locally; None without skills in the category", default=None)]
+    education_match: Annotated[Optional[float], Field(ge=0, le=100, description="Education requirements match percentage, computed locally; None without skills in the category", default=None)]
+    industry_match: Annotated[Optional[float], Field(ge=0, le=100, description="Industry experience match percentage, computed locally; None without skills in the category", default=None)]
     skill_details: List[SkillScore] = Field(
         description="Detailed scoring for each skill",
         default_factory=list
@@ -54,6 +72,18 @@ class JobMatchScore(BaseModel):
         }
     )
 
+    @model_validator(mode='after')
+    def compute_scores(self):
+        score_matches([self])
+        return self
+
+    def apply_scores(self, row):
+        """Set the category and overall scores from a row of ``scoring.score_matrix``."""
+        for category, value in zip(CATEGORIES, row[:-1]):
+            # NaN: no skills in this category
+            setattr(self, f'{category}_match', round(float(value), 2) if value == value else None)
+        self.overall_match = round(float(row[-1]), 2)
+
     def to_markdown(self):
         """
         Generates a markdown string representation of the CompanyResearch model.
@@ -63,18 +93,18 @@ class JobMatchScore(BaseModel):
         **Job Match Score**
         
         **Overall Match:** {self.overall_match:.2f}%
-        **Technical Skills Match:** {self.technical_skills_match:.2f}%
-        **Soft Skills Match:** {self.soft_skills_match:.2f}%
-        **Experience Match:** {self.experience_match:.2f}%
-        **Education Match:** {self.education_match:.2f}%
-        **Industry Match:** {self.industry_match:.2f}%
+        **Technical Skills Match:** {_percent(self.technical_skills_match)}
+        **Soft Skills Match:** {_percent(self.soft_skills_match)}
+        **Experience Match:** {_percent(self.experience_match)}
+        **Education Match:** {_percent(self.education_match)}
+        **Industry Match:** {_percent(self.industry_match)}
         
         **Strengths:**\n{chr(10).join(f'- {s}' for s in self.strengths)}
         **Gaps:**\n{chr(10).join(f'- {g}' for g in self.gaps)}
         
         **Skill Details:**\n{''.join(f'- {s.skill_name}: {s.match_level:.2f} (Exp: {s.years_experience}, Context: {s.context_score:.2f})\n' for s in self.skill_details)}
         
-        **Scoring Factors:**\n{chr(10).join(f'- {k}: {v:.2f}' for k, v in self.scoring_factors)}
+        **Scoring Factors:**\n{chr(10).join(f'- {k}: {v:.2f}' for k, v in self.scoring_factors.items())}
         """.strip()
         return markdown
 
@@ -247,13 +277,14 @@ class JobRequirements(BaseModel):
         **Application Deadline:** {self.application_deadline or 'N/A'}
         **Special Instructions:**\n{chr(10).join(f'- {s}' for s in self.special_instructions)}
         
-        **Match Score:**\n{self.match_score}
+        **Match Score:**\n{self.match_score.to_markdown()}
         **Score Explanation:**\n{chr(10).join(f'- {s}' for s in self.score_explanation)}
         """.strip()
         return markdown
     
     @classmethod
-    def json_to_md(cls, file_path='output/job_analysis.json'):
+    def json_to_md(cls, file_path=None, run_id=None):
+        file_path = file_path or output_path('job_analysis.json', run_id)
         with open(file_path, 'r') as f:
             data = json.load(f)
         # Use model_validate for Pydantic v2, parse_obj for v1
@@ -297,7 +328,8 @@ class ResumeOptimization(BaseModel):
         return markdown
 
     @classmethod
-    def json_to_md(cls, file_path='output/resume_optimization.json'):
+    def json_to_md(cls, file_path=None, run_id=None):
+        file_path = file_path or output_path('resume_optimization.json', run_id)
         with open(file_path, 'r') as f:
             data = json.load(f)
         # Use model_validate for Pydantic v2, parse_obj for v1
@@ -346,7 +378,8 @@ class CompanyResearch(BaseModel):
         return markdown
     
     @classmethod
-    def json_to_md(cls, file_path='output/company_research.json'):
+    def json_to_md(cls, file_path=None, run_id=None):
+        file_path = file_path or output_path('company_research.json', run_id)
         with open(file_path, 'r') as f:
             data = json.load(f)
         # Use model_validate for Pydantic v2, parse_obj for v1
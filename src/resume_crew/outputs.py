@@ -0,0 +1,28 @@
+import os
+import uuid
+from datetime import datetime
+
+
+# Relative to the working directory: crewAI strips leading slashes from output_file.
+OUTPUT_ROOT = os.environ.get('RESUME_CREW_OUTPUT_DIR', 'output')
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free identifier for a single crew run."""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def run_output_dir(run_id: str = None) -> str:
+    """
+    Directory holding the outputs of ``run_id``.
+
+    Without a run id this is the shared output root, which is where runs
+    wrote their files before outputs were namespaced.
+    """
+    if run_id is None:
+        return OUTPUT_ROOT
+    return os.path.join(OUTPUT_ROOT, 'runs', run_id)
+
+
+def output_path(file_name: str, run_id: str = None) -> str:
+    return os.path.join(run_output_dir(run_id), file_name)
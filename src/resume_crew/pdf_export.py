@@ -0,0 +1,137 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import markdown
+from fpdf import FPDF
+
+from .models import CompanyResearch, JobRequirements, ResumeOptimization
+from .outputs import output_path
+
+
+# Run outputs in the order they appear in the exported PDF.
+ARTIFACTS = [
+    ('optimized_resume.md', 'Optimized Resume'),
+    ('final_report.md', 'Final Report'),
+    ('job_analysis.json', 'Job Analysis'),
+    ('resume_optimization.json', 'Resume Optimization'),
+    ('company_research.json', 'Company Research'),
+]
+
+MODELS = {
+    'job_analysis.json': JobRequirements,
+    'resume_optimization.json': ResumeOptimization,
+    'company_research.json': CompanyResearch,
+}
+
+# A unicode TTF family is used when found here, otherwise the built-in
+# latin-1 Helvetica.
+FONT_DIR = os.environ.get('PDF_FONT_DIR', '/usr/share/fonts/truetype/dejavu')
+FONT_FILES = {'': 'DejaVuSans.ttf', 'B': 'DejaVuSans-Bold.ttf'}
+
+# Emoji and other astral-plane characters, which neither font has glyphs for.
+UNSUPPORTED = re.compile('[\U00010000-\U0010FFFF️‍]')
+LATIN1_REPLACEMENTS = str.maketrans({
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+    '–': '-', '—': '-', '•': '-', '…': '...', ' ': ' ',
+})
+
+
+def artifact_markdown(path: str) -> str:
+    """Markdown of a run output: markdown files as they are, JSON outputs via their model."""
+    with open(path, 'r') as f:
+        content = f.read()
+    name = os.path.basename(path)
+    if not name.endswith('.json'):
+        return content
+    model_cls = MODELS.get(name)
+    if model_cls is None:
+        return f"```\n{json.dumps(json.loads(content), indent=2)}\n```"
+    # to_markdown() keeps the source indentation, which markdown would read as code blocks.
+    return '\n'.join(line.strip() for line in model_cls.model_validate_json(content).to_markdown().splitlines())
+
+
+class PdfRenderer:
+    """
+    One PDF document that many markdown sections are rendered into.
+
+    Fonts are loaded once when the renderer is created and page setup,
+    margins and the outline are shared by all sections, so adding a section
+    only costs its own layout.
+    """
+
+    def __init__(self, font_dir: str = FONT_DIR):
+        self.pdf = FPDF()
+        self.pdf.set_auto_page_break(auto=True, margin=15)
+        if all(os.path.isfile(os.path.join(font_dir, f)) for f in FONT_FILES.values()):
+            for style, file_name in FONT_FILES.items():
+                self.pdf.add_font('Body', style, os.path.join(font_dir, file_name))
+            # No oblique file is needed for the few italics in the outputs.
+            self.pdf.add_font('Body', 'I', os.path.join(font_dir, FONT_FILES['']))
+            self.pdf.add_font('Body', 'BI', os.path.join(font_dir, FONT_FILES['B']))
+            self.family, self.unicode = 'Body', True
+        else:
+            self.family, self.unicode = 'Helvetica', False
+        self.pdf.set_font(self.family, size=11)
+
+    def clean(self, text: str) -> str:
+        text = UNSUPPORTED.sub('', text)
+        if not self.unicode:
+            text = text.translate(LATIN1_REPLACEMENTS).encode('latin-1', 'replace').decode('latin-1')
+        return text
+
+    def add_markdown(self, title: str, markdown_text: str) -> None:
+        self.pdf.add_page()
+        self.pdf.start_section(title)
+        html = markdown.markdown(self.clean(markdown_text), extensions=['nl2br', 'tables'])
+        self.pdf.write_html(html, font_family=self.family)
+
+    @property
+    def pages(self) -> int:
+        return self.pdf.pages_count
+
+    def output(self, pdf_file: Optional[str] = None) -> bytes:
+        data = bytes(self.pdf.output())
+        if pdf_file:
+            os.makedirs(os.path.dirname(pdf_file) or '.', exist_ok=True)
+            with open(pdf_file, 'wb') as f:
+                f.write(data)
+        return data
+
+
+def export_run(run_id: Optional[str] = None, pdf_file: Optional[str] = None) -> dict:
+    """
+    Render every output of a run into a single PDF, one section per artifact.
+
+    Writes ``run_report.pdf`` to the run directory unless ``pdf_file`` is
+    given, and returns the file, page count and render time.
+    """
+    start = time.perf_counter()
+    renderer = PdfRenderer()
+    sections = 0
+    for file_name, title in ARTIFACTS:
+        path = output_path(file_name, run_id)
+        if os.path.isfile(path):
+            renderer.add_markdown(title, artifact_markdown(path))
+            sections += 1
+    pdf_file = pdf_file or output_path('run_report.pdf', run_id)
+    if sections:
+        renderer.output(pdf_file)
+    return {
+        'run_id': run_id,
+        'pdf_file': pdf_file if sections else None,
+        'sections': sections,
+        'pages': renderer.pages if sections else 0,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def export_runs(run_ids: List[Optional[str]], workers: Optional[int] = None) -> List[dict]:
+    """Export many runs, spread over a pool of ``workers`` processes (all CPUs by default)."""
+    if workers == 1 or len(run_ids) <= 1:
+        return [export_run(run_id) for run_id in run_ids]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(export_run, run_ids))
@@ -0,0 +1,71 @@
+import os
+import zlib
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .resume_index import tokenize
+
+
+# Width of the hashed term vectors. Collisions only make the prefilter a
+# little more lenient; 8192 columns keep 1000 resumes at 32 MB.
+HASH_DIM = int(os.environ.get('PREFILTER_HASH_DIM', 2 ** 13))
+
+
+def terms(text: str) -> List[str]:
+    """Stemmed words and word pairs, so "machine learning" also matches as a phrase."""
+    words = tokenize(text)
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+def hash_terms(text: str, dim: int = HASH_DIM) -> np.ndarray:
+    """Distinct columns of the terms of ``text``; crc32 is stable across processes, unlike ``hash``."""
+    return np.unique(np.fromiter((zlib.crc32(term.encode()) % dim for term in terms(text)), dtype=np.int64))
+
+
+def presence_matrix(texts: Sequence[str], dim: int = HASH_DIM) -> np.ndarray:
+    """Binary (documents, dim) matrix of the hashed terms each document contains."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        matrix[i, hash_terms(text, dim)] = 1.0
+    return matrix
+
+
+def inverse_document_frequency(presence: np.ndarray) -> np.ndarray:
+    """Smoothed idf of every column; terms every candidate has count least."""
+    n_docs = presence.shape[0]
+    return np.log((1 + n_docs) / (1 + presence.sum(axis=0))) + 1
+
+
+def requirement_matrix(requirements: Sequence[str], idf: np.ndarray) -> np.ndarray:
+    """(requirements, dim) matrix of idf-weighted terms, each row summing to 1."""
+    matrix = np.zeros((len(requirements), idf.shape[0]), dtype=np.float32)
+    for i, requirement in enumerate(requirements):
+        columns = hash_terms(requirement, idf.shape[0])
+        if columns.size:
+            matrix[i, columns] = idf[columns] / idf[columns].sum()
+    return matrix
+
+
+def prefilter_scores(requirements: Sequence[Tuple[str, float]], texts: Sequence[str],
+                     dim: int = HASH_DIM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every text by how much of each requirement it covers.
+
+    ``requirements`` are (text, weight) pairs. The coverage matrix is the
+    product of the requirements' idf-weighted term rows with the texts'
+    binary term rows: entry (r, d) is the share of requirement ``r``'s term
+    weight found in text ``d``. A text's score is the weighted mean coverage
+    over all requirements, 0-100. Returns the scores and the coverage matrix.
+    """
+    presence = presence_matrix(texts, dim)
+    if not requirements or not len(texts):
+        return np.zeros(len(texts)), np.zeros((len(requirements), len(texts)))
+    weights = np.array([weight for _, weight in requirements], dtype=np.float32)
+    coverage = requirement_matrix([text for text, _ in requirements], inverse_document_frequency(presence)) @ presence.T
+    return 100 * weights @ coverage / weights.sum(), coverage
+
+
+def shortlist(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """Indices of the ``top_n`` best scores, best first; ties keep the input order."""
+    return np.argsort(-scores, kind='stable')[:top_n]
@@ -0,0 +1,232 @@
+import csv
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Sequence, Tuple
+
+from .batch import percentile
+from .crew import RecruiterCrew
+from .ingest import convert_resume
+from .instrumentation import RunMetrics
+from .models import JobRequirements
+from .outputs import new_run_id, output_path, run_output_dir
+from .prefilter import prefilter_scores, shortlist
+from .scoring import CATEGORIES
+
+
+# Requirement lists the prefilter matches resumes against, with their weight.
+# Soft skills are rarely spelled out in a resume, so they count least.
+REQUIREMENT_FIELDS = (
+    ('technical_skills', 1.0),
+    ('tools_and_technologies', 1.0),
+    ('experience_requirements', 1.0),
+    ('certifications_required', 1.0),
+    ('education_requirements', 0.5),
+    ('industry_knowledge', 0.5),
+    ('nice_to_have', 0.5),
+    ('soft_skills', 0.25),
+)
+
+DEFAULT_TOP_N = int(os.environ.get('RECRUITER_TOP_N', 20))
+
+RANKING_COLUMNS = ('rank', 'candidate', 'prefilter_score', 'overall_match') \
+    + tuple(f'{c}_match' for c in CATEGORIES) + ('status',)
+
+
+def find_resumes(paths: Sequence[str]) -> List[str]:
+    """Resume files among ``paths``; directories contribute their (non-hidden) files in name order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if not name.startswith('.') and os.path.isfile(os.path.join(path, name)))
+        else:
+            files.append(path)
+    return files
+
+
+def read_resume(path: str) -> str:
+    """Markdown of a resume file; PDFs and text are converted in memory, other formats via file2md."""
+    with open(path, 'rb') as f:
+        return convert_resume(f.read(), os.path.basename(path))
+
+
+def requirement_list(requirements: JobRequirements) -> List[Tuple[str, float]]:
+    """Distinct (requirement, weight) pairs of a job, for the prefilter."""
+    pairs, seen = [], set()
+    for field, weight in REQUIREMENT_FIELDS:
+        for text in getattr(requirements, field):
+            key = text.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                pairs.append((text, weight))
+    return pairs
+
+
+def requirements_prompt(requirements: JobRequirements) -> str:
+    """The job title and requirement lists as minified JSON, for the scoring task's prompt."""
+    data = {'job_title': requirements.job_title, 'job_level': requirements.job_level}
+    data.update((field, getattr(requirements, field)) for field, _ in REQUIREMENT_FIELDS)
+    return json.dumps({k: v for k, v in data.items() if v}, ensure_ascii=False, separators=(',', ':'))
+
+
+def extract_requirements(job_url: str, llm_model: str, run_id: str, checkpoint: bool = True,
+                         routes_file: Optional[str] = None) -> Tuple[JobRequirements, bool]:
+    """The job's requirements and whether they came from a checkpoint rather than the LLM."""
+    recruiter_crew = RecruiterCrew(llm_model, run_id=run_id, checkpoint=checkpoint, routes_file=routes_file)
+    crew = recruiter_crew.requirements_crew()
+    result = crew.kickoff(inputs={'job_url': job_url})
+    task = crew.tasks[0]
+    if not isinstance(result.pydantic, JobRequirements):
+        raise RuntimeError(f"Could not extract the requirements of {job_url}: {result.raw[:200]}")
+    return result.pydantic, task.restored
+
+
+def format_ranking(rows: List[dict], limit: Optional[int] = None) -> str:
+    """Render ranking rows as a fixed-width text table."""
+    def cell(row: dict, column: str) -> str:
+        if row.get(column) is not None:
+            return str(row[column])
+        # A scored candidate without a category score had no skills in it.
+        return 'N/A' if row['status'] == 'ok' and column.endswith('_match') else ''
+
+    shown = rows[:limit] if limit else rows
+    cells = [[cell(row, c) for c in RANKING_COLUMNS] for row in shown]
+    widths = [max(len(c), *(len(line[i]) for line in cells)) if cells else len(c)
+              for i, c in enumerate(RANKING_COLUMNS)]
+    lines = ['  '.join(c.ljust(w) for c, w in zip(RANKING_COLUMNS, widths))]
+    lines.append('  '.join('-' * w for w in widths))
+    lines.extend('  '.join(cell.ljust(w) for cell, w in zip(line, widths)) for line in cells)
+    if len(shown) < len(rows):
+        lines.append(f'... {len(rows) - len(shown)} more')
+    return '\n'.join(lines)
+
+
+def _rank_key(record: dict) -> tuple:
+    scored = record['status'] == 'ok'
+    return (not record['shortlisted'], not scored, -(record.get('overall_match') or 0), -record['prefilter_score'])
+
+
+def run_recruiter(job_url: str, resumes: Sequence[str], llm_model: str, top_n: int = DEFAULT_TOP_N,
+                  workers: int = 4, checkpoint: bool = True, routes_file: Optional[str] = None,
+                  run_id: Optional[str] = None) -> dict:
+    """
+    Rank many resumes against one job posting.
+
+    The job's requirements are extracted once (and checkpointed, so the next
+    pool for the same job skips the LLM). Every resume is scored locally by
+    how much of the requirements its terms cover (see ``prefilter.py``), and
+    only the ``top_n`` best go through LLM scoring, ``workers`` candidates at
+    a time. The ranking, with the shortlisted candidates by overall match
+    first and the rest by prefilter score, is written with throughput stats
+    to ``ranking.json`` and ``ranking.csv`` in the run's output directory and
+    returned.
+    """
+    run_id = run_id or new_run_id()
+    start = time.perf_counter()
+
+    files = find_resumes(resumes)
+    records, texts = [], []
+    for path in files:
+        record = {'candidate': os.path.basename(path), 'path': path, 'prefilter_score': 0.0,
+                  'shortlisted': False, 'status': 'skipped'}
+        try:
+            texts.append(read_resume(path))
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = f'Could not read the resume: {e}'
+            texts.append('')
+        records.append(record)
+    convert_time = time.perf_counter() - start
+
+    requirements_start = time.perf_counter()
+    requirements, requirements_cached = extract_requirements(job_url, llm_model, run_id, checkpoint, routes_file)
+    requirements_time = time.perf_counter() - requirements_start
+    pairs = requirement_list(requirements)
+    if not pairs:
+        print(f"No requirements found in {job_url}; candidates are shortlisted in file order")
+
+    prefilter_start = time.perf_counter()
+    scores, _ = prefilter_scores(pairs, texts)
+    readable = [i for i, record in enumerate(records) if record['status'] != 'error']
+    chosen = [readable[i] for i in shortlist(scores[readable], top_n)]
+    prefilter_time = time.perf_counter() - prefilter_start
+    for record, score in zip(records, scores):
+        record['prefilter_score'] = round(float(score), 2)
+
+    prompt = requirements_prompt(requirements)
+
+    def score_candidate(index: int) -> None:
+        record = records[index]
+        record['shortlisted'] = True
+        candidate_start = time.perf_counter()
+        try:
+            crew = RecruiterCrew(llm_model, resume_markdown=texts[index], run_id=run_id,
+                                 checkpoint=checkpoint, routes_file=routes_file).scoring_crew()
+            with RunMetrics(crew) as metrics:
+                result = crew.kickoff(inputs={'job_url': job_url, 'requirements': prompt})
+            match = result.pydantic
+            if match is None:
+                raise RuntimeError(f"No structured score: {result.raw[:200]}")
+            record['status'] = 'ok'
+            record['overall_match'] = match.overall_match
+            record.update((f'{c}_match', getattr(match, f'{c}_match')) for c in CATEGORIES)
+            record['strengths'] = match.strengths
+            record['gaps'] = match.gaps
+            record['tokens'] = sum(r['prompt_tokens'] + r['completion_tokens'] for r in metrics.summary())
+            record['cost'] = round(sum(r['cost'] for r in metrics.summary()), 4)
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = f"{e}\n{traceback.format_exc()}"
+        record['latency'] = round(time.perf_counter() - candidate_start, 3)
+
+    scoring_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in as_completed([executor.submit(score_candidate, i) for i in chosen]):
+            future.result()
+    scoring_time = time.perf_counter() - scoring_start
+
+    ranking = sorted(records, key=_rank_key)
+    for rank, record in enumerate(ranking, 1):
+        record['rank'] = rank
+    latencies = [r['latency'] for r in ranking if r['shortlisted'] and r['status'] == 'ok']
+    wall_time = time.perf_counter() - start
+    manifest = {
+        'job_url': job_url,
+        'llm_model': llm_model,
+        'run_id': run_id,
+        'top_n': top_n,
+        'workers': workers,
+        'requirements': len(pairs),
+        'stats': {
+            'candidates': len(records),
+            'unreadable': sum(1 for r in records if r['status'] == 'error' and not r['shortlisted']),
+            'shortlisted': len(chosen),
+            'scored': len(latencies),
+            'failed': len(chosen) - len(latencies),
+            'requirements_cached': requirements_cached,
+            'convert_time': round(convert_time, 3),
+            'requirements_time': round(requirements_time, 3),
+            'prefilter_time': round(prefilter_time, 4),
+            'prefilter_per_second': round(len(records) / prefilter_time, 1) if prefilter_time else 0.0,
+            'scoring_time': round(scoring_time, 3),
+            'scored_per_minute': round(len(chosen) / scoring_time * 60, 2) if scoring_time else 0.0,
+            'p50_latency': percentile(latencies, 50),
+            'p95_latency': percentile(latencies, 95),
+            'wall_time': round(wall_time, 3),
+            'candidates_per_minute': round(len(records) / wall_time * 60, 2) if wall_time else 0.0,
+            'tokens': sum(r.get('tokens', 0) for r in records),
+            'cost': round(sum(r.get('cost', 0.0) for r in records), 4),
+        },
+        'ranking': ranking,
+    }
+    os.makedirs(run_output_dir(run_id), exist_ok=True)
+    with open(output_path('ranking.json', run_id), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    with open(output_path('ranking.csv', run_id), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RANKING_COLUMNS + ('path',), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(ranking)
+    return manifest
@@ -0,0 +1,409 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from crewai import Task
+from pydantic import BaseModel, ValidationError
+
+
+# Validation passes before giving up; each pass fixes every error it can.
+MAX_PASSES = 5
+
+# crewAI's own parser copes with these, so they do not save a round-trip.
+LENIENT_FIXES = {'code fence', 'surrounding text'}
+
+_FENCE = re.compile(r'```[a-zA-Z]*[ \t]*\n?(.*?)(?:```|$)', re.DOTALL)
+_NUMBER = re.compile(r'[-+]?\d+(?:\.\d+)?')
+_WORD = re.compile(r'[A-Za-z0-9_.+\-%$]+')
+_LITERALS = {'true': 'true', 'false': 'false', 'null': 'null', 'True': 'true', 'False': 'false',
+             'None': 'null', 'NaN': 'null', 'Infinity': 'null', 'undefined': 'null'}
+_TRUE_WORDS = ('true', 'yes', 'y', 'required', 'must', 'mandatory', 'essential')
+
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def repair_enabled() -> bool:
+    return os.environ.get('RESUME_CREW_REPAIR', '1') != '0'
+
+
+def repair_stats() -> Dict[str, int]:
+    """
+    Outcomes of local repair in this process: ``valid`` (nothing to repair
+    that crewAI could not handle), ``repaired`` (an LLM conversion call
+    saved), ``failed`` (handed to crewAI's converter), and one count per
+    kind of fix.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(outcome: str, fixes: List[str]) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+        for fix in fixes:
+            _stats[f'fix:{fix}'] += 1
+
+
+def extract_json(text: str) -> Tuple[str, List[str]]:
+    """The JSON object in an answer: inside a code fence and from its first ``{`` on."""
+    fixes = []
+    fences = [block for block in _FENCE.findall(text) if '{' in block]
+    if fences:
+        text = max(fences, key=len)
+        fixes.append('code fence')
+    start = text.find('{')
+    if start < 0:
+        return text, fixes
+    if text[:start].strip() and not fixes:
+        fixes.append('surrounding text')
+    return text[start:], fixes
+
+
+def fix_json_syntax(text: str) -> Tuple[str, List[str]]:
+    """
+    Rewrite almost-JSON into JSON, in one pass over the characters.
+
+    Handles single-quoted strings, unescaped quotes and newlines inside
+    strings, comments, Python literals, unquoted keys, missing and trailing
+    commas, mismatched brackets, text after the object and output truncated
+    before the object was closed.
+    """
+    out: List[str] = []
+    fixes: List[str] = []
+    stack: List[str] = []
+    i, n = 0, len(text)
+
+    def fix(name):
+        if name not in fixes:
+            fixes.append(name)
+
+    def last():
+        for token in reversed(out):
+            if token.strip():
+                return token.strip()[-1]
+        return ''
+
+    def before_value():
+        if last() and last() not in '{[:,':
+            out.append(',')
+            fix('missing comma')
+
+    def drop_trailing(chars):
+        while out and (not out[-1].strip() or out[-1] in chars):
+            if out[-1] in chars:
+                fix('trailing comma' if out[-1] == ',' else 'truncated')
+            out.pop()
+
+    while i < n:
+        char = text[i]
+        if char in '"\'':
+            quote, j, chars = char, i + 1, []
+            if quote == "'":
+                fix('single quotes')
+            while j < n:
+                c = text[j]
+                if c == '\\' and j + 1 < n:
+                    chars.append("'" if text[j + 1] == "'" else text[j:j + 2])
+                    j += 2
+                    continue
+                if c == quote:
+                    rest = text[j + 1:]
+                    following = rest.lstrip(' \t')
+                    # A quote only ends the string when a delimiter or a new line follows.
+                    if quote == "'" or not following or following[0] in ',:}]\r\n':
+                        break
+                    fix('unescaped quote')
+                    chars.append('\\"')
+                elif c == '"':
+                    chars.append('\\"')
+                elif c == '\n':
+                    chars.append('\\n')
+                else:
+                    chars.append(c)
+                j += 1
+            if j >= n:
+                fix('truncated')
+            before_value()
+            out.append('"' + ''.join(chars) + '"')
+            i = j + 1
+        elif char in ' \t\r\n':
+            out.append(char)
+            i += 1
+        elif text.startswith('//', i) or text.startswith('/*', i):
+            end = text.find('\n' if text[i + 1] == '/' else '*/', i + 2)
+            i = n if end < 0 else end + (1 if text[i + 1] == '/' else 2)
+            fix('comments')
+        elif char in '{[':
+            before_value()
+            stack.append('}' if char == '{' else ']')
+            out.append(char)
+            i += 1
+        elif char in '}]':
+            i += 1
+            if not stack:
+                continue
+            drop_trailing(',')
+            closer = stack.pop()
+            if closer != char:
+                fix('brackets')
+            out.append(closer)
+            if not stack:
+                if text[i:].strip():
+                    fix('surrounding text')
+                break
+        elif char == ',':
+            if last() in '{[,':
+                fix('trailing comma')
+            else:
+                out.append(',')
+            i += 1
+        elif char == ':':
+            out.append(':')
+            i += 1
+        else:
+            match = _WORD.match(text, i)
+            if not match:
+                i += 1
+                continue
+            word = match.group()
+            i = match.end()
+            before_value()
+            if word in _LITERALS:
+                if _LITERALS[word] != word:
+                    fix('python literals')
+                out.append(_LITERALS[word])
+            elif re.fullmatch(r'-?(0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?', word):
+                out.append(word)
+            elif text[i:].lstrip().startswith(':'):
+                fix('unquoted keys')
+                out.append(json.dumps(word))
+            else:
+                # Bare values such as 85% or 5+ are kept as strings and coerced later.
+                fix('unquoted values')
+                out.append(json.dumps(word))
+    if stack:
+        drop_trailing(',:')
+        if last() == '"' and stack[-1] == '}' and re.search(r'[{,]\s*"(?:[^"\\]|\\.)*"\s*$', ''.join(out)):
+            # A key whose value was cut off.
+            joined = re.sub(r',?\s*"(?:[^"\\]|\\.)*"\s*$', '', ''.join(out))
+            out = [joined]
+        fix('truncated')
+        out.extend(reversed(stack))
+    return ''.join(out), fixes
+
+
+def _unwrap(annotation: Any) -> Any:
+    """The annotation without Optional and Annotated wrappers."""
+    while True:
+        origin = get_origin(annotation)
+        if origin is Union:
+            args = [a for a in get_args(annotation) if a is not type(None)]
+            if len(args) != 1:
+                return annotation
+            annotation = args[0]
+        elif hasattr(annotation, '__metadata__'):
+            annotation = get_args(annotation)[0]
+        else:
+            return annotation
+
+
+def _annotation_at(model: Type[BaseModel], loc: tuple) -> Any:
+    annotation = model
+    for step in loc:
+        annotation = _unwrap(annotation)
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            field = annotation.model_fields.get(step)
+            if field is None:
+                return None
+            annotation = field.annotation
+        elif get_origin(annotation) in (list, List):
+            annotation = get_args(annotation)[0]
+        elif get_origin(annotation) in (dict, Dict):
+            annotation = get_args(annotation)[1]
+        else:
+            return None
+    return _unwrap(annotation)
+
+
+def _key_form(key: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', key.lower()).strip('_')
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if isinstance(value, str):
+        match = _NUMBER.search(value.replace(',', ''))
+        if match:
+            return float(match.group())
+    return None
+
+
+def _fix_error(data: Any, model: Type[BaseModel], error: dict, fixes: List[str]) -> bool:
+    """Fix one validation error in place, using the constraint it reports; False if it cannot."""
+    loc, kind, value, ctx = tuple(error['loc']), error['type'], error.get('input'), error.get('ctx') or {}
+    parent = data
+    for step in loc[:-1]:
+        try:
+            parent = parent[step]
+        except (KeyError, IndexError, TypeError):
+            return False
+    key = loc[-1] if loc else None
+    if key is None or not isinstance(parent, (dict, list)):
+        return False
+
+    if kind == 'missing':
+        if not isinstance(parent, dict):
+            return False
+        for other in list(parent):
+            if isinstance(other, str) and _key_form(other) == key:
+                parent[key] = parent.pop(other)
+                fixes.append('renamed keys')
+                return True
+        annotation = _annotation_at(model, loc)
+        origin = get_origin(annotation) or annotation
+        if origin in (list, dict):
+            parent[key] = origin()
+            fixes.append('filled missing')
+            return True
+        return False
+    if kind in ('greater_than_equal', 'greater_than') and isinstance(value, (int, float)):
+        parent[key] = ctx.get('ge', ctx.get('gt'))
+        fixes.append('clamped')
+        return True
+    if kind in ('less_than_equal', 'less_than') and isinstance(value, (int, float)):
+        limit = ctx.get('le', ctx.get('lt'))
+        if limit == 1 and 2 <= value <= 100:
+            # A percentage in a 0-1 field; smaller overshoots are clamped.
+            parent[key] = value / 100
+            fixes.append('rescaled')
+        else:
+            parent[key] = limit
+            fixes.append('clamped')
+        return True
+    if kind in ('float_parsing', 'float_type', 'int_parsing', 'int_type', 'int_from_float'):
+        number = _to_number(value)
+        if number is None:
+            owner = _annotation_at(model, loc[:-1])
+            if isinstance(parent, dict) and isinstance(owner, type) and issubclass(owner, BaseModel) \
+                    and key in owner.model_fields and not owner.model_fields[key].is_required():
+                # An optional number given as text without digits, e.g. "N/A": use the default.
+                del parent[key]
+                fixes.append('dropped invalid')
+                return True
+            return False
+        parent[key] = round(number) if kind.startswith('int') else number
+        fixes.append('coerced')
+        return True
+    if kind in ('bool_parsing', 'bool_type') and isinstance(value, str):
+        parent[key] = value.strip().lower().startswith(_TRUE_WORDS)
+        fixes.append('coerced')
+        return True
+    if kind == 'string_type':
+        if isinstance(value, list):
+            parent[key] = ', '.join(str(item) for item in value)
+        elif value is None:
+            parent[key] = ''
+        elif isinstance(value, dict):
+            parent[key] = json.dumps(value)
+        else:
+            parent[key] = str(value)
+        fixes.append('coerced')
+        return True
+    if kind == 'list_type':
+        parent[key] = [] if value is None else [value]
+        fixes.append('coerced')
+        return True
+    if kind == 'dict_type':
+        if value is None:
+            parent[key] = {}
+        elif isinstance(value, str):
+            parent[key] = {'details': value}
+        else:
+            return False
+        fixes.append('coerced')
+        return True
+    return False
+
+
+def fit_to_model(data: Any, model: Type[BaseModel]) -> Tuple[Optional[BaseModel], List[str]]:
+    """
+    Validate ``data`` against ``model``, fixing what the validation errors
+    point at: out-of-range numbers are clamped to the field's bounds (or
+    divided by 100 when a 0-1 field got a percentage), numbers and booleans
+    written as text are parsed, scalars and lists are converted where a list
+    or a string is expected, and missing lists and dicts are filled in.
+    """
+    fixes: List[str] = []
+    for _ in range(MAX_PASSES):
+        try:
+            return model.model_validate(data), list(dict.fromkeys(fixes))
+        except ValidationError as e:
+            errors = e.errors()
+        if not isinstance(data, dict):
+            break
+        fixed = [_fix_error(data, model, error, fixes) for error in errors]
+        if not all(fixed):
+            break
+    return None, list(dict.fromkeys(fixes))
+
+
+def repair_output(text: str, model: Type[BaseModel]) -> Tuple[Optional[BaseModel], List[str]]:
+    """
+    ``model`` parsed from an agent's answer without calling an LLM, and the
+    fixes that were needed; None when the answer cannot be repaired locally.
+    """
+    candidate, fixes = extract_json(text)
+    if not candidate.startswith('{'):
+        return None, fixes
+    try:
+        data = json.loads(candidate, strict=False)
+    except ValueError:
+        candidate, syntax_fixes = fix_json_syntax(candidate)
+        fixes += [fix for fix in syntax_fixes if fix not in fixes]
+        try:
+            data = json.loads(candidate, strict=False)
+        except ValueError:
+            return None, fixes
+    instance, value_fixes = fit_to_model(data, model)
+    fixes += [fix for fix in value_fixes if fix not in fixes]
+    return instance, fixes
+
+
+class RepairedOutputTask(Task):
+    """
+    Task whose structured output is repaired locally before crewAI falls
+    back to asking the LLM to convert it.
+
+    ``repair_output`` strips code fences, fixes JSON syntax and fits values
+    to the ``output_pydantic`` (or ``output_json``) model's constraints.
+    Only when that fails does the answer go to crewAI's converter, which
+    costs another LLM request. The outcome is kept in ``output_repair``
+    and counted in ``repair_stats``.
+    """
+    output_repair: Optional[str] = None
+    output_fixes: List[str] = []
+
+    def _export_output(self, result: str):
+        model = self.output_pydantic or self.output_json
+        if model is None or not repair_enabled():
+            return super()._export_output(result)
+        start = time.perf_counter()
+        instance, fixes = repair_output(result, model)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.output_fixes = fixes
+        if instance is None:
+            self.output_repair = 'failed'
+            _record('failed', fixes)
+            print(f"Output of {self.name} could not be repaired locally; converting it with the LLM")
+            return super()._export_output(result)
+        self.output_repair = 'repaired' if set(fixes) - LENIENT_FIXES else 'valid'
+        _record(self.output_repair, fixes)
+        if self.output_repair == 'repaired':
+            print(f"Repaired output of {self.name} locally in {elapsed:.1f} ms: {', '.join(fixes)}")
+        if self.output_json:
+            return None, instance.model_dump()
+        return instance, None
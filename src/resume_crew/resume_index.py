@@ -0,0 +1,137 @@
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+from .tokens import count_tokens
+
+
+HEADING = re.compile(r'^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$')
+BULLET = re.compile(r'^\s*(?:[-*+•]|\d+[.)])\s+')
+WORD = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with you your our we their they i me my
+""".split())
+
+
+# Words are cut to this many characters, a crude stemmer that matches
+# "analysis" with "analysing" and "finance" with "financial".
+STEM_LENGTH = 5
+
+
+def tokenize(text: str) -> List[str]:
+    return [w[:STEM_LENGTH] for w in WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+@dataclass
+class Chunk:
+    """A bullet or paragraph of the resume together with the section it is in."""
+    position: int
+    section: str
+    text: str
+    tokens: int = 0
+
+
+def split_resume(markdown: str) -> List[Chunk]:
+    """
+    Split resume markdown into chunks: one per bullet and one per paragraph.
+
+    Wrapped continuation lines stay with their bullet, and every chunk
+    keeps the path of headings above it so it can be shown on its own.
+    """
+    chunks, headings, current = [], [], []
+
+    def flush():
+        text = ' '.join(line.strip() for line in current).strip()
+        if text:
+            section = ' > '.join(text for _, text in headings)
+            chunks.append(Chunk(len(chunks), section, text, count_tokens(text)))
+        current.clear()
+
+    for line in markdown.splitlines():
+        heading = HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            # Levels may be skipped, e.g. a resume with only ## headings.
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, heading.group(2)))
+        elif not line.strip():
+            flush()
+        elif BULLET.match(line):
+            flush()
+            current.append(BULLET.sub('', line, count=1))
+        else:
+            current.append(line)
+    flush()
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over resume chunks; the section heading is indexed with the text."""
+
+    def __init__(self, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(f'{c.section} {c.text}')) for c in chunks]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = sum(self.lengths) / len(self.lengths) if chunks else 0.0
+        doc_freq = Counter(term for tf in self.term_freqs for term in tf)
+        n = len(chunks)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+        self.total_tokens = sum(c.tokens for c in chunks)
+
+    @classmethod
+    def from_markdown(cls, markdown: str) -> 'BM25Index':
+        return cls(split_resume(markdown))
+
+    def scores(self, query: str) -> List[float]:
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        scores = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            scores.append(sum(
+                self.idf[t] * tf[t] * (self.k1 + 1) / (tf[t] + norm) for t in terms if t in tf
+            ))
+        return scores
+
+    def search(self, query: str, top_k: int = 8, max_tokens: int = 0) -> List[Tuple[float, Chunk]]:
+        """
+        Best ``top_k`` matching chunks whose tokens fit in ``max_tokens``
+        (0 for no budget), returned in resume order.
+        """
+        ranked = sorted(zip(self.scores(query), self.chunks), key=lambda pair: -pair[0])
+        selected, used = [], 0
+        for score, chunk in ranked:
+            if len(selected) >= top_k or score <= 0:
+                break
+            if max_tokens and used + chunk.tokens > max_tokens:
+                continue
+            selected.append((score, chunk))
+            used += chunk.tokens
+        return sorted(selected, key=lambda pair: pair[1].position)
+
+
+def load_index(md_file_path: str) -> BM25Index:
+    """Index of a resume file, rebuilt only when the file changes."""
+    stat = os.stat(md_file_path)
+    return _load_index(md_file_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _load_index(md_file_path: str, mtime_ns: int, size: int) -> BM25Index:
+    with open(md_file_path, 'r') as f:
+        return BM25Index.from_markdown(f.read())
+
+
+@lru_cache(maxsize=32)
+def index_for_markdown(markdown: str) -> BM25Index:
+    """Index of resume markdown held in memory, shared by every crew using the same text."""
+    return BM25Index.from_markdown(markdown)
@@ -0,0 +1,229 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+import yaml
+try:
+    from crewai.utilities.exceptions.context_window_exceeding_exception import LLMContextLengthExceededError
+except ImportError:  # crewai releases before the exception was renamed
+    from crewai.utilities.exceptions.context_window_exceeding_exception import (
+        LLMContextLengthExceededException as LLMContextLengthExceededError,
+    )
+
+from .instrumentation import current_task, track_current_task
+from .llm_cache import CachedLLM
+from .llm_pool import is_ollama, ollama_params, pooled, warm_ollama
+
+
+DEFAULT_ROUTES_FILE = os.environ.get(
+    'MODEL_ROUTES', os.path.join(os.path.dirname(__file__), 'config', 'models.yaml')
+)
+
+# Stands for the model passed to the crew (--llm_model, or the one picked in the app).
+DEFAULT_MODEL = 'default'
+
+
+@dataclass
+class Route:
+    """Model (and optional endpoint) an agent or task runs on, with an optional fallback."""
+    model: str
+    api_base: Optional[str] = None
+    fallback: Optional['Route'] = None
+
+
+@dataclass
+class FallbackPolicy:
+    """
+    When a primary model counts as unhealthy.
+
+    Only the last ``window`` calls are considered, and at least
+    ``min_calls`` of them are needed. Once the p95 latency (seconds) or the
+    error rate crosses its threshold, calls go to the fallback for
+    ``cooldown`` seconds, after which the primary gets a fresh window.
+    """
+    window: int = 20
+    min_calls: int = 5
+    max_p95_latency: float = 60.0
+    max_error_rate: float = 0.25
+    cooldown: float = 300.0
+
+
+class ModelHealth:
+    """Latency and error window of one model endpoint, shared by every LLM that calls it."""
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.calls = deque(maxlen=window)
+        self.tripped_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.calls.append((latency, ok))
+
+    @property
+    def p95_latency(self) -> float:
+        with self._lock:
+            latencies = sorted(latency for latency, _ in self.calls)
+        if not latencies:
+            return 0.0
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            calls = list(self.calls)
+        if not calls:
+            return 0.0
+        return sum(1 for _, ok in calls if not ok) / len(calls)
+
+    def healthy(self, policy: FallbackPolicy) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self.tripped_at is not None:
+                if now - self.tripped_at < policy.cooldown:
+                    return False
+                self.tripped_at = None
+                self.calls.clear()
+            if len(self.calls) < policy.min_calls:
+                return True
+        p95, error_rate = self.p95_latency, self.error_rate
+        if p95 <= policy.max_p95_latency and error_rate <= policy.max_error_rate:
+            return True
+        with self._lock:
+            self.tripped_at = now
+        print(f"Model {self.name} unhealthy (p95 {p95:.1f}s, {error_rate:.0%} errors), "
+              f"using its fallback for {policy.cooldown:.0f}s")
+        return False
+
+
+_health: Dict[tuple, ModelHealth] = {}
+_health_lock = threading.Lock()
+
+
+def get_model_health(model: str, api_base: Optional[str] = None, window: int = FallbackPolicy.window) -> ModelHealth:
+    """Process-wide health window of ``model`` at ``api_base``."""
+    with _health_lock:
+        key = (model, api_base)
+        if key not in _health:
+            _health[key] = ModelHealth(f"{model}@{api_base}" if api_base else model, window)
+        return _health[key]
+
+
+class RoutedLLM(CachedLLM):
+    """
+    LLM that follows a ``Route`` and falls back when its primary is unhealthy.
+
+    Latency and errors of every uncached call are recorded in the primary's
+    ``ModelHealth``. While the primary breaches the ``FallbackPolicy``, calls
+    go to the fallback route, and a failed call is retried there once the
+    failure trips the policy. ``task_routes`` override the route for calls
+    made on behalf of the named tasks, told by ``from_task`` or by the task
+    running on the calling thread. Ollama models get a keep-alive and
+    are loaded in the background as soon as a route uses them.
+    """
+
+    def __init__(self, route: Route, policy: FallbackPolicy, task_routes: Optional[Dict[str, Route]] = None,
+                 **kwargs):
+        super().__init__(route.model, api_base=route.api_base, **{**ollama_params(route.model), **kwargs})
+        self.route = route
+        self.policy = policy
+        self.health = get_model_health(route.model, route.api_base, policy.window)
+        if is_ollama(route.model):
+            warm_ollama(route.model, route.api_base)
+        self.fallback_llm = None
+        if route.fallback is not None:
+            self.fallback_llm = pooled(RoutedLLM, route.fallback, policy, **kwargs)
+        self.task_llms = {name: pooled(RoutedLLM, task_route, policy, **kwargs)
+                          for name, task_route in (task_routes or {}).items()}
+        if self.task_llms:
+            track_current_task()
+
+    def model_for(self, task_name: Optional[str]) -> str:
+        """Primary model of the calls made for ``task_name``."""
+        delegate = self.task_llms.get(task_name)
+        return delegate.model if delegate is not None else self.model
+
+    def _delegate(self, llm: 'RoutedLLM', messages, **kwargs) -> Any:
+        # The agent executor adds its stop words to the agent's LLM only.
+        llm.stop = self.stop
+        return llm.call(messages, **kwargs)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs) -> Any:
+        kwargs.update(tools=tools, callbacks=callbacks, available_functions=available_functions)
+        # Older crewAI releases do not pass from_task; the task started on this thread is the caller.
+        task = kwargs.get('from_task') or current_task()
+        delegate = self.task_llms.get(getattr(task, 'name', None))
+        if delegate is not None:
+            return self._delegate(delegate, messages, **kwargs)
+        if self.fallback_llm is not None and not self.health.healthy(self.policy):
+            return self._delegate(self.fallback_llm, messages, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            response = super().call(messages, **kwargs)
+        except LLMContextLengthExceededError:
+            raise
+        except Exception:
+            self.health.record(time.perf_counter() - start, ok=False)
+            if self.fallback_llm is not None and not self.health.healthy(self.policy):
+                return self._delegate(self.fallback_llm, messages, **kwargs)
+            raise
+        if not self.last_call_cached:
+            self.health.record(time.perf_counter() - start, ok=True)
+        return response
+
+
+class ModelRouter:
+    """
+    Routing table mapping agents and tasks to models.
+
+    ``config`` has the layout of ``config/models.yaml``: ``agents`` and
+    ``tasks`` map names to a route, either a model name or a mapping with
+    ``model``, ``api_base`` and ``fallback`` (itself a route). A task's
+    route overrides the route of the agent that runs it. Anything not listed
+    runs on ``default_model``, which ``default`` in a route also stands for.
+    """
+
+    def __init__(self, default_model: str, config: Optional[dict] = None):
+        config = config or {}
+        self.default_model = default_model
+        known = {f.name for f in fields(FallbackPolicy)}
+        self.policy = FallbackPolicy(**{k: v for k, v in (config.get('fallback_policy') or {}).items() if k in known})
+        self.agent_routes = {name: self.parse_route(spec) for name, spec in (config.get('agents') or {}).items()}
+        self.task_routes = {name: self.parse_route(spec) for name, spec in (config.get('tasks') or {}).items()}
+
+    @classmethod
+    def from_file(cls, default_model: str, path: Optional[str] = DEFAULT_ROUTES_FILE) -> 'ModelRouter':
+        config = None
+        if path and os.path.isfile(path):
+            with open(path, 'r') as f:
+                config = yaml.safe_load(f)
+        return cls(default_model, config)
+
+    def parse_route(self, spec: Any) -> Route:
+        if spec is None or isinstance(spec, str):
+            spec = {'model': spec}
+        model = spec.get('model') or DEFAULT_MODEL
+        fallback = spec.get('fallback')
+        return Route(
+            model=self.default_model if model == DEFAULT_MODEL else model,
+            api_base=spec.get('api_base'),
+            fallback=self.parse_route(fallback) if fallback else None,
+        )
+
+    def route(self, agent: str, task: Optional[str] = None) -> Route:
+        if task in self.task_routes:
+            return self.task_routes[task]
+        return self.agent_routes.get(agent) or Route(self.default_model)
+
+    def llm(self, agent: str, **kwargs) -> RoutedLLM:
+        """
+        Shared LLM for ``agent``; the task routes apply to the tasks it runs.
+        ``kwargs`` are passed to the LLM of every route.
+        """
+        return pooled(RoutedLLM, self.route(agent), self.policy, task_routes=self.task_routes, **kwargs)
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from crewai import Crew, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.formatter import aggregate_raw_outputs_from_task_outputs
+
+
+@dataclass
+class TaskTiming:
+    """Start and end timestamps of a single task run by the scheduler."""
+    task_name: str
+    agent_role: str
+    started_at: str
+    finished_at: str
+    duration: float
+    offset: float
+
+
+class ParallelScheduler:
+    """
+    Runs the tasks of a crew as a DAG instead of one after another.
+
+    The graph is built from each task's ``context`` list (as declared in
+    ``config/tasks.yaml``). A task starts as soon as every task in its
+    context has finished, so independent branches run concurrently. Tasks
+    assigned to the same agent are serialized, because an agent keeps a
+    single executor.
+    """
+
+    def __init__(self, crew: Crew, timings_file: Optional[str] = None):
+        self.crew = crew
+        self.timings_file = timings_file
+        self.timings: List[TaskTiming] = []
+
+    def build_graph(self) -> Dict[Task, List[Task]]:
+        """Map every task to the list of tasks it depends on."""
+        tasks = self.crew.tasks
+        graph = {}
+        for task in tasks:
+            context = task.context if isinstance(task.context, list) else []
+            unknown = [dep for dep in context if dep not in tasks]
+            if unknown:
+                raise ValueError(
+                    f"Task '{task.name}' depends on tasks that are not part of the crew: "
+                    f"{[dep.name for dep in unknown]}"
+                )
+            graph[task] = list(context)
+        self._check_acyclic(graph)
+        return graph
+
+    @staticmethod
+    def _check_acyclic(graph: Dict[Task, List[Task]]) -> None:
+        visiting, done = set(), set()
+
+        def visit(task):
+            if task in done:
+                return
+            if task in visiting:
+                raise ValueError(f"Cyclic task context detected at '{task.name}'")
+            visiting.add(task)
+            for dep in graph[task]:
+                visit(dep)
+            visiting.discard(task)
+            done.add(task)
+
+        for task in graph:
+            visit(task)
+
+    def _prepare(self, inputs: Optional[dict]) -> None:
+        # Mirrors the setup done by Crew.kickoff before tasks are executed.
+        if inputs is not None:
+            self.crew._inputs = inputs
+            self.crew._interpolate_inputs(inputs)
+        for agent in self.crew.agents:
+            agent.crew = self.crew
+            if not agent.function_calling_llm:
+                agent.function_calling_llm = self.crew.function_calling_llm
+            if not agent.step_callback:
+                agent.step_callback = self.crew.step_callback
+            agent.create_agent_executor()
+
+    async def kickoff_async(self, inputs: Optional[dict] = None) -> CrewOutput:
+        graph = self.build_graph()
+        self._prepare(inputs)
+        self.timings = []
+
+        futures: Dict[Task, asyncio.Future] = {
+            task: asyncio.get_running_loop().create_future() for task in graph
+        }
+        agent_locks: Dict[int, asyncio.Lock] = {}
+        origin = time.perf_counter()
+
+        async def run_task(task: Task) -> None:
+            try:
+                upstream = [await futures[dep] for dep in graph[task]]
+                context = aggregate_raw_outputs_from_task_outputs(upstream) if upstream else None
+                lock = agent_locks.setdefault(id(task.agent), asyncio.Lock())
+                async with lock:
+                    started_at = datetime.now(timezone.utc)
+                    start = time.perf_counter()
+                    output = await asyncio.to_thread(
+                        task.execute_sync, agent=task.agent, context=context, tools=task.tools
+                    )
+                    end = time.perf_counter()
+                self.timings.append(TaskTiming(
+                    task_name=task.name,
+                    agent_role=task.agent.role if task.agent else "None",
+                    started_at=started_at.isoformat(),
+                    finished_at=datetime.now(timezone.utc).isoformat(),
+                    duration=round(end - start, 3),
+                    offset=round(start - origin, 3),
+                ))
+                futures[task].set_result(output)
+            except BaseException as e:
+                futures[task].set_exception(e)
+                raise
+
+        runners = [asyncio.create_task(run_task(task)) for task in graph]
+        try:
+            await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
+            for future in futures.values():
+                if future.done() and not future.cancelled():
+                    future.exception()
+            self._write_timings(time.perf_counter() - origin)
+
+        outputs: List[TaskOutput] = [futures[task].result() for task in self.crew.tasks]
+        final = outputs[-1]
+        self.crew.usage_metrics = self.crew.calculate_usage_metrics()
+        return CrewOutput(
+            raw=final.raw,
+            pydantic=final.pydantic,
+            json_dict=final.json_dict,
+            tasks_output=outputs,
+            token_usage=self.crew.usage_metrics,
+        )
+
+    def kickoff(self, inputs: Optional[dict] = None) -> CrewOutput:
+        return asyncio.run(self.kickoff_async(inputs))
+
+    def _write_timings(self, wall_time: float) -> None:
+        if not self.timings_file:
+            return
+        os.makedirs(os.path.dirname(self.timings_file) or '.', exist_ok=True)
+        report = {
+            'wall_time': round(wall_time, 3),
+            'sequential_time': round(sum(t.duration for t in self.timings), 3),
+            'tasks': [asdict(t) for t in sorted(self.timings, key=lambda t: t.offset)],
+        }
+        with open(self.timings_file, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Order of the score columns; the JobMatchScore field of each category is
+# ``<category>_match``.
+CATEGORIES = ('technical_skills', 'soft_skills', 'experience', 'education', 'industry')
+
+DEFAULT_WEIGHTS = {
+    'technical_skills': 0.35,
+    'soft_skills': 0.20,
+    'experience': 0.25,
+    'education': 0.10,
+    'industry': 0.10,
+}
+
+# Share of a skill's value coming from its match level; the rest is the
+# relevance of the context the skill was used in.
+MATCH_SHARE = 0.7
+# Nice-to-have skills count half as much as required ones.
+OPTIONAL_WEIGHT = 0.5
+
+_ALIASES = {
+    'technical': 'technical_skills',
+    'technical_skill': 'technical_skills',
+    'tools': 'technical_skills',
+    'soft': 'soft_skills',
+    'soft_skill': 'soft_skills',
+    'experiences': 'experience',
+    'education_requirements': 'education',
+    'certifications': 'education',
+    'industry_knowledge': 'industry',
+    'domain': 'industry',
+}
+
+
+def category_name(category: str) -> Optional[str]:
+    """The CATEGORIES entry ``category`` refers to, or None if it names none of them."""
+    key = (category or '').strip().lower().replace(' ', '_').replace('-', '_')
+    if key.endswith('_match'):
+        key = key[:-len('_match')]
+    key = _ALIASES.get(key, key)
+    return key if key in CATEGORIES else None
+
+
+def category_index(category: str) -> int:
+    """Column of a skill's ``category`` in the score matrix; unknown categories count as technical."""
+    name = category_name(category)
+    return CATEGORIES.index(name) if name else 0
+
+
+def normalize_weights(scoring_factors: Dict[str, float]) -> np.ndarray:
+    """Category weights in CATEGORIES order; accepts keys like ``technical_skills_weight`` and ignores unknown ones."""
+    weights = np.array([DEFAULT_WEIGHTS[c] for c in CATEGORIES], dtype=float)
+    for key, value in (scoring_factors or {}).items():
+        if key.endswith('_weight'):
+            key = key[:-len('_weight')]
+        name = category_name(key)
+        if name:
+            weights[CATEGORIES.index(name)] = float(value)
+    return weights
+
+
+def score_matrix(skills: Sequence[Sequence], factors: Sequence[Dict[str, float]]) -> np.ndarray:
+    """
+    Compute the category and overall scores of many job/resume pairs at once.
+
+    ``skills[i]`` holds the SkillScore entries of pair ``i`` and ``factors[i]``
+    its scoring weights. Each category score is the weighted mean of the
+    skill values in that category, scaled to 0-100; the overall score is the
+    weighted mean of the categories that have at least one skill. Returns an
+    array of shape ``(pairs, len(CATEGORIES) + 1)`` with the overall score in
+    the last column and NaN for categories without skills.
+    """
+    n_pairs = len(skills)
+    width = max((len(s) for s in skills), default=0) or 1
+    values = np.zeros((n_pairs, width))
+    weights = np.zeros((n_pairs, width))
+    categories = np.zeros((n_pairs, width), dtype=int)
+    for i, pair_skills in enumerate(skills):
+        for j, skill in enumerate(pair_skills):
+            values[i, j] = MATCH_SHARE * skill.match_level + (1 - MATCH_SHARE) * skill.context_score
+            weights[i, j] = 1.0 if skill.required else OPTIONAL_WEIGHT
+            categories[i, j] = category_index(skill.category)
+
+    one_hot = np.eye(len(CATEGORIES))[categories]  # (pairs, skills, categories)
+    weighted_sum = np.einsum('ps,psc->pc', values * weights, one_hot)
+    weight_sum = np.einsum('ps,psc->pc', weights, one_hot)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        category_scores = np.where(weight_sum > 0, 100 * weighted_sum / weight_sum, np.nan)
+
+    factor_matrix = np.stack([normalize_weights(f) for f in factors]) if n_pairs else np.zeros((0, len(CATEGORIES)))
+    present = ~np.isnan(category_scores)
+    active = np.where(present, factor_matrix, 0.0)
+    total = active.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overall = np.where(total > 0, np.nansum(category_scores * active, axis=1) / total, 0.0)
+    return np.column_stack([category_scores, overall])
+
+
+def score_matches(matches: List) -> np.ndarray:
+    """Write the computed scores into a list of JobMatchScore models and return the matrix."""
+    scores = score_matrix([m.skill_details for m in matches], [m.scoring_factors for m in matches])
+    for match, row in zip(matches, scores):
+        match.apply_scores(row)
+    return scores
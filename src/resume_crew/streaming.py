@@ -0,0 +1,297 @@
+import json
+import threading
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+try:
+    from crewai.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent, TaskStartedEvent
+except ImportError:  # crewai releases before the events package was split out
+    from crewai.utilities.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent, TaskStartedEvent
+
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON object while it is still being generated.
+
+    ``feed`` consumes the next chunk of LLM output and ``value`` returns the
+    object received so far: open strings, arrays and objects are closed,
+    while keys without a value and unfinished numbers or literals are left
+    out. Text before the object (a ReAct "Thought", a code fence) is
+    skipped; when ``start_marker`` is given the object must follow it.
+    Every character is scanned once; ``value`` only re-parses when new
+    characters arrived.
+    """
+
+    def __init__(self, start_marker: Optional[str] = 'Final Answer:'):
+        self.start_marker = start_marker
+        self.preamble = ''
+        self.started = False
+        self.finished = False
+        self.chunks: List[str] = []
+        self.length = 0
+        # One [opener, state] per open container; states are 'key', 'colon',
+        # 'value' and 'comma' for objects and 'value' and 'comma' for arrays.
+        self.stack: List[list] = []
+        self.in_string = False
+        self.string_is_key = False
+        self.escape_at = -1
+        self.unicode_left = 0
+        self.in_literal = False
+        # Longest prefix that is valid JSON once closed, and its closers.
+        self.safe_end = 0
+        self.safe_closers = ''
+        self._value = None
+        self._value_length = -1
+
+    def feed(self, chunk: str) -> None:
+        if self.finished or not chunk:
+            return
+        if not self.started:
+            self.preamble += chunk
+            start = self._find_start()
+            if start < 0:
+                return
+            self.started = True
+            chunk, self.preamble = self.preamble[start:], ''
+        self.chunks.append(chunk)
+        for char in chunk:
+            self._scan(char)
+            self.length += 1
+            if self.finished:
+                break
+
+    def _find_start(self) -> int:
+        offset = 0
+        if self.start_marker and not self.preamble.lstrip().startswith(('{', '```')):
+            offset = self.preamble.find(self.start_marker)
+            if offset < 0:
+                return -1
+        return self.preamble.find('{', offset)
+
+    def _closers(self) -> str:
+        return ''.join(_CLOSERS[opener] for opener, _ in reversed(self.stack))
+
+    def _mark_safe(self, end: int) -> None:
+        self.safe_end = end
+        self.safe_closers = self._closers()
+
+    def _value_done(self, end: int) -> None:
+        if not self.stack:
+            self.finished = True
+            self.safe_end, self.safe_closers = end, ''
+            return
+        self.stack[-1][1] = 'comma'
+        self._mark_safe(end)
+
+    def _scan(self, char: str) -> None:
+        pos = self.length
+        if self.in_string:
+            if self.unicode_left:
+                self.unicode_left -= 1
+                if not self.unicode_left:
+                    self.escape_at = -1
+            elif self.escape_at >= 0:
+                if char == 'u':
+                    self.unicode_left = 4
+                else:
+                    self.escape_at = -1
+            elif char == '\\':
+                self.escape_at = pos
+            elif char == '"':
+                self.in_string = False
+                if self.string_is_key:
+                    self.stack[-1][1] = 'colon'
+                else:
+                    self._value_done(pos + 1)
+            return
+
+        if self.in_literal:
+            if char in ',}] \t\r\n':
+                self.in_literal = False
+                self._value_done(pos)
+            else:
+                return
+
+        if char in ' \t\r\n':
+            return
+        if char in '{[':
+            if self.stack:
+                self.stack[-1][1] = 'comma'
+            self.stack.append([char, 'key' if char == '{' else 'value'])
+            self._mark_safe(pos + 1)
+        elif char in '}]':
+            if self.stack:
+                self.stack.pop()
+            self._value_done(pos + 1)
+        elif char == '"':
+            self.in_string = True
+            self.string_is_key = bool(self.stack) and self.stack[-1] == ['{', 'key']
+        elif char == ':':
+            if self.stack:
+                self.stack[-1][1] = 'value'
+        elif char == ',':
+            if self.stack:
+                self.stack[-1][1] = 'key' if self.stack[-1][0] == '{' else 'value'
+        else:
+            self.in_literal = True
+
+    def value(self) -> Optional[Any]:
+        """The object as far as it has been received, or None before it starts."""
+        if not self.started:
+            return None
+        if self._value_length == self.length:
+            return self._value
+        # Read from the UI thread while feed() runs on the task's thread, so
+        # nothing is mutated here; an inconsistent snapshot keeps the last value.
+        text = ''.join(self.chunks)
+        if self.in_string and not self.string_is_key:
+            # Show the string received so far, without a half-written escape.
+            end = self.escape_at if self.escape_at >= 0 else self.length
+            candidate = text[:end] + '"' + self._closers()
+        else:
+            candidate = text[:self.safe_end] + self.safe_closers
+        try:
+            self._value = json.loads(candidate, strict=False)
+        except ValueError:
+            pass
+        self._value_length = self.length
+        return self._value
+
+
+def partial_model(model_cls: Type[BaseModel], data: Optional[dict]) -> Optional[BaseModel]:
+    """Unvalidated ``model_cls`` holding the top-level fields received so far."""
+    if not isinstance(data, dict):
+        return None
+    return model_cls.model_construct(**{k: v for k, v in data.items() if k in model_cls.model_fields})
+
+
+class TaskStream:
+    """Streamed output of the latest LLM call of one task."""
+
+    def __init__(self, name: str, model_cls: Optional[Type[BaseModel]] = None):
+        self.name = name
+        self.model_cls = model_cls
+        self.calls = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.chunks: List[str] = []
+        self.parser = IncrementalJSONParser() if self.model_cls else None
+
+    def add(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        if self.parser:
+            self.parser.feed(chunk)
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.chunks)
+
+    @property
+    def answer(self) -> str:
+        """Text after the ReAct "Final Answer:" marker, or all text without one."""
+        return self.text.split('Final Answer:', 1)[-1].lstrip()
+
+    def partial(self) -> Optional[BaseModel]:
+        """Partial structured output, for tasks with an ``output_pydantic`` model."""
+        if not self.parser:
+            return None
+        return partial_model(self.model_cls, self.parser.value())
+
+
+# Chunks are emitted on the thread that runs the task; older crewai
+# releases do not say which task a chunk belongs to, so it is tracked per
+# thread as a fallback.
+_current = threading.local()
+_active: List['RunStream'] = []
+_active_lock = threading.Lock()
+_handlers_registered = False
+
+
+def _owner(task) -> Optional['RunStream']:
+    with _active_lock:
+        for stream in _active:
+            if id(task) in stream.task_ids:
+                return stream
+    return None
+
+
+def _register_handlers() -> None:
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    _handlers_registered = True
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def on_task_started(source, event):
+        task = getattr(event, 'task', None) or source
+        _current.task = task
+        stream = _owner(task)
+        if stream:
+            stream._task_started(task)
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def on_llm_started(source, event):
+        task = getattr(event, 'from_task', None) or getattr(_current, 'task', None)
+        stream = _owner(task)
+        if stream:
+            stream._call_started(task)
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def on_chunk(source, event):
+        if getattr(event, 'tool_call', None):
+            return
+        task = getattr(event, 'from_task', None) or getattr(_current, 'task', None)
+        stream = _owner(task)
+        if stream:
+            stream._chunk(task, event.chunk)
+
+
+class RunStream:
+    """
+    Live view of the LLM output of one crew run.
+
+    Use as a context manager around the kickoff of a crew whose LLMs have
+    ``stream=True``. ``tasks`` maps task names, in start order, to a
+    ``TaskStream`` holding the text of the task's latest LLM call and, for
+    structured tasks, its partially parsed model.
+    """
+
+    def __init__(self, crew):
+        self.task_ids = {id(task) for task in crew.tasks}
+        self.tasks: Dict[str, TaskStream] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'RunStream':
+        _register_handlers()
+        with _active_lock:
+            _active.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with _active_lock:
+            _active.remove(self)
+
+    @property
+    def current(self) -> Optional[TaskStream]:
+        with self._lock:
+            return next(reversed(self.tasks.values()), None)
+
+    def _task_started(self, task) -> None:
+        with self._lock:
+            self.tasks[task.name] = TaskStream(task.name, task.output_pydantic)
+
+    def _call_started(self, task) -> None:
+        stream = self.tasks.get(task.name)
+        if stream:
+            stream.calls += 1
+            stream.reset()
+
+    def _chunk(self, task, chunk: str) -> None:
+        stream = self.tasks.get(task.name)
+        if stream:
+            stream.add(chunk)
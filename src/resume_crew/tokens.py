@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+
+def count_tokens(text: str) -> int:
+    """LLM token count, using tiktoken when available and ~4 chars per token otherwise."""
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        return None
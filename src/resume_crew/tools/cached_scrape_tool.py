@@ -0,0 +1,138 @@
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool
+from pydantic import PrivateAttr
+
+from ..cache import DiskCache, DEFAULT_CACHE_DIR
+from ..job_extract import extract_job_posting
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key for a URL: lowercase host, no fragment, no tracking params, sorted query."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_')
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+SCRAPED_PREFIX = "The following text is scraped website content:\n\n"
+
+
+def html_to_text(html: str) -> str:
+    """Same normalization as ScrapeWebsiteTool, so cached and live content look identical."""
+    parsed = BeautifulSoup(html, "html.parser")
+    text = SCRAPED_PREFIX
+    text += parsed.get_text(" ")
+    text = re.sub("[ \t]+", " ", text)
+    text = re.sub("\\s+\n\\s+", "\n", text)
+    return text
+
+
+class CachedScrapeWebsiteTool(ScrapeWebsiteTool):
+    """
+    ScrapeWebsiteTool with a persistent, TTL-based page cache.
+
+    Fresh entries are served straight from disk. Stale entries are
+    revalidated with a conditional request (ETag / Last-Modified) and only
+    downloaded again when the server reports a change. In offline mode no
+    request is made at all: pages come from the cache or from a fixture
+    directory containing an ``index.json`` that maps URLs to HTML files.
+
+    With ``extract_job`` (on unless ``SCRAPE_EXTRACT=0``) only the job
+    description is kept, see ``extract_job_posting``; the tokens of the page
+    before and after extraction are printed and summed in ``report()``.
+    """
+    ttl: float = float(os.environ.get('SCRAPE_CACHE_TTL', 6 * 60 * 60))
+    offline: bool = os.environ.get('SCRAPE_OFFLINE', '') == '1'
+    fixtures_dir: Optional[str] = os.environ.get('SCRAPE_FIXTURES_DIR')
+    cache_path: str = os.path.join(DEFAULT_CACHE_DIR, 'scrape.sqlite')
+    extract_job: bool = os.environ.get('SCRAPE_EXTRACT', '1') != '0'
+
+    _cache: Optional[DiskCache] = PrivateAttr(default=None)
+    _session: Optional[requests.Session] = PrivateAttr(default=None)
+    _stats: Dict[str, int] = PrivateAttr(default_factory=lambda: {'pages': 0, 'tokens_before': 0, 'tokens_after': 0})
+
+    @property
+    def cache(self) -> DiskCache:
+        if self._cache is None:
+            self._cache = DiskCache(self.cache_path, default_ttl=self.ttl)
+        return self._cache
+
+    def _run(self, **kwargs: Any) -> Any:
+        website_url = kwargs.get("website_url", self.website_url)
+        key = normalize_url(website_url)
+        if self.extract_job:
+            # Fragments are stripped from normalized URLs, so this cannot collide with a page.
+            key += '#job'
+        entry = self.cache.get_entry(key, include_expired=True)
+        if entry is not None and not entry.expired:
+            return entry.value
+
+        if self.offline:
+            if entry is not None:
+                return entry.value
+            return self._load_fixture(website_url)
+
+        headers = dict(self.headers or {})
+        if entry is not None:
+            if entry.meta.get('etag'):
+                headers['If-None-Match'] = entry.meta['etag']
+            if entry.meta.get('last_modified'):
+                headers['If-Modified-Since'] = entry.meta['last_modified']
+
+        if self._session is None:
+            self._session = requests.Session()
+        page = self._session.get(
+            website_url,
+            timeout=15,
+            headers=headers,
+            cookies=self.cookies if self.cookies else {},
+        )
+        if page.status_code == 304 and entry is not None:
+            self.cache.touch(key, ttl=self.ttl)
+            self.cache.incr('revalidated')
+            return entry.value
+
+        page.encoding = page.apparent_encoding
+        text = self._page_text(page.text, website_url) if page.ok else html_to_text(page.text)
+        if page.ok:
+            meta = {
+                'etag': page.headers.get('ETag'),
+                'last_modified': page.headers.get('Last-Modified'),
+            }
+            self.cache.set(key, text, ttl=self.ttl, meta=meta)
+        return text
+
+    def _load_fixture(self, website_url: str) -> str:
+        if self.fixtures_dir:
+            index_path = os.path.join(self.fixtures_dir, 'index.json')
+            with open(index_path, 'r') as f:
+                index = {normalize_url(url): name for url, name in json.load(f).items()}
+            key = normalize_url(website_url)
+            if key in index:
+                with open(os.path.join(self.fixtures_dir, index[key]), 'r') as f:
+                    return self._page_text(f.read(), website_url)
+        raise RuntimeError(f"{website_url} is not cached and offline mode is enabled")
+
+    def _page_text(self, html: str, website_url: str) -> str:
+        if not self.extract_job:
+            return html_to_text(html)
+        posting = extract_job_posting(html, website_url)
+        self._stats['pages'] += 1
+        self._stats['tokens_before'] += posting.tokens_before
+        self._stats['tokens_after'] += posting.tokens_after
+        print(f"Job posting {website_url}: {posting.tokens_before} -> {posting.tokens_after} tokens ({posting.layout})")
+        return SCRAPED_PREFIX + posting.text
+
+    def report(self) -> Dict[str, int]:
+        """Pages extracted by this tool and their tokens before and after extraction."""
+        return {**self._stats, 'saved_tokens': self._stats['tokens_before'] - self._stats['tokens_after']}
@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, ClassVar, Dict, Optional
+
+from crewai_tools import SerperDevTool
+from pydantic import PrivateAttr
+
+from ..cache import DiskCache, DEFAULT_CACHE_DIR
+
+
+SearchBackend = Callable[[str, str], dict]
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+class FixtureSearchBackend:
+    """
+    Local stand-in for the Serper API, used for tests and benchmarks.
+
+    Results are looked up by normalized query in a dict or in a JSON file
+    of the form ``{"<query>": <serper response>}``. Unknown queries get an
+    empty organic result list. ``latency`` simulates the API round-trip.
+    """
+
+    def __init__(self, fixtures=None, latency: float = 0.0):
+        if isinstance(fixtures, str):
+            with open(fixtures, 'r') as f:
+                fixtures = json.load(f)
+        self.fixtures = {normalize_query(q): r for q, r in (fixtures or {}).items()}
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, search_query: str, search_type: str) -> dict:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.fixtures.get(normalize_query(search_query), {'organic': []})
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool whose raw API responses are memoized in a shared DiskCache.
+
+    Entries are keyed by the normalized query and the search parameters and
+    expire after ``ttl`` seconds. Concurrent lookups of the same key within a
+    process share a single in-flight request. The latency of every request
+    is stored with its entry so that cache hits can report the time saved.
+    """
+    ttl: float = float(os.environ.get('SEARCH_CACHE_TTL', 7 * 24 * 60 * 60))
+    cache_path: str = os.path.join(DEFAULT_CACHE_DIR, 'search.sqlite')
+    search_backend: Optional[SearchBackend] = None
+
+    _cache: Optional[DiskCache] = PrivateAttr(default=None)
+
+    _inflight: ClassVar[Dict[str, Future]] = {}
+    _inflight_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        # Lets tests and benchmarks swap the API for fixtures without touching crew.py.
+        if self.search_backend is None and os.environ.get('SEARCH_FIXTURES_FILE'):
+            self.search_backend = FixtureSearchBackend(os.environ['SEARCH_FIXTURES_FILE'])
+
+    @property
+    def cache(self) -> DiskCache:
+        if self._cache is None:
+            self._cache = DiskCache(self.cache_path, default_ttl=self.ttl)
+        return self._cache
+
+    def cache_key(self, search_query: str, search_type: str) -> str:
+        return json.dumps([
+            normalize_query(search_query), search_type.lower(), self.n_results,
+            self.country or '', self.location or '', self.locale or ''
+        ])
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        key = self.cache_key(search_query, search_type)
+        entry = self.cache.get_entry(key)
+        if entry is not None:
+            self.cache.incr('saved_latency', entry.meta.get('latency', 0.0))
+            return entry.value
+
+        with CachedSerperDevTool._inflight_lock:
+            future = CachedSerperDevTool._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = CachedSerperDevTool._inflight[key] = Future()
+        if not owner:
+            self.cache.incr('coalesced')
+            return future.result()
+
+        try:
+            start = time.perf_counter()
+            if self.search_backend is not None:
+                results = self.search_backend(search_query, search_type)
+            else:
+                results = super()._make_api_request(search_query, search_type)
+            latency = time.perf_counter() - start
+            self.cache.set(key, results, ttl=self.ttl, meta={'latency': latency})
+            future.set_result(results)
+            return results
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with CachedSerperDevTool._inflight_lock:
+                CachedSerperDevTool._inflight.pop(key, None)
+
+    def report(self) -> Dict[str, float]:
+        """Hit rate, coalesced requests and total seconds saved by the cache."""
+        stats = self.cache.stats()
+        return {
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': stats['hit_rate'],
+            'coalesced': stats.get('coalesced', 0),
+            'saved_latency': stats.get('saved_latency', 0.0),
+            'entries': stats['entries'],
+        }
@@ -0,0 +1,19 @@
+from typing import Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel
+
+
+class ResumeReadToolInput(BaseModel):
+    """Input schema for ResumeReadTool; the resume is fixed when the tool is created."""
+
+
+class ResumeReadTool(BaseTool):
+    """Returns the whole resume markdown, which is held in memory rather than read from a file."""
+    name: str = "Read the candidate's resume"
+    description: str = "Returns the full text of the candidate's resume in markdown."
+    args_schema: Type[BaseModel] = ResumeReadToolInput
+    markdown: str
+
+    def _run(self) -> str:
+        return self.markdown
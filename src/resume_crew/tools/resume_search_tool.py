@@ -0,0 +1,65 @@
+import os
+from typing import Optional, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ..resume_index import index_for_markdown, load_index
+
+
+class ResumeSearchToolInput(BaseModel):
+    """Input schema for ResumeSearchTool."""
+    query: str = Field(..., description="Job requirements, skills or topics to find in the resume.")
+    top_k: Optional[int] = Field(None, description="Maximum number of resume excerpts to return.")
+
+
+class ResumeSearchTool(BaseTool):
+    """
+    Returns only the resume bullets and paragraphs relevant to a query.
+
+    The resume markdown is split into chunks and ranked with BM25 (see
+    ``resume_index.py``); the best ``top_k`` chunks that fit in
+    ``max_tokens`` are returned in resume order under their section
+    headings, so agents do not need the whole CV in their prompt. The
+    resume is given either as ``markdown`` text or as ``md_file_path``.
+    """
+    name: str = "Search the candidate's resume"
+    description: str = (
+        "Finds the parts of the candidate's resume that are relevant to the given job "
+        "requirements, skills or topics. Pass the requirements you are checking as the query; "
+        "call it again with other terms to look up more."
+    )
+    args_schema: Type[BaseModel] = ResumeSearchToolInput
+    md_file_path: Optional[str] = None
+    markdown: Optional[str] = None
+    top_k: int = int(os.environ.get('RESUME_SEARCH_TOP_K', 8))
+    max_tokens: int = int(os.environ.get('RESUME_SEARCH_MAX_TOKENS', 800))
+
+    _served_tokens: int = PrivateAttr(default=0)
+    _resume_tokens: int = PrivateAttr(default=0)
+
+    def _run(self, query: str, top_k: Optional[int] = None) -> str:
+        index = index_for_markdown(self.markdown) if self.markdown is not None else load_index(self.md_file_path)
+        results = index.search(query, top_k=top_k or self.top_k, max_tokens=self.max_tokens)
+        if not results:
+            return 'No part of the resume matches this query; try other terms.'
+
+        lines, section = [], None
+        for _, chunk in results:
+            if chunk.section != section:
+                section = chunk.section
+                lines.append(f'\n## {section}' if section else '')
+            lines.append(f'- {chunk.text}')
+        tokens = sum(chunk.tokens for _, chunk in results)
+        self._served_tokens += tokens
+        self._resume_tokens += index.total_tokens
+        header = (f'{len(results)} of {len(index.chunks)} resume excerpts '
+                  f'({tokens} of {index.total_tokens} tokens):')
+        return header + '\n'.join(lines)
+
+    def report(self) -> dict:
+        return {
+            'served_tokens': self._served_tokens,
+            'resume_tokens': self._resume_tokens,
+            'saved_tokens': self._resume_tokens - self._served_tokens,
+        }
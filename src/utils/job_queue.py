@@ -0,0 +1,168 @@
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .output_handler import StreamlitProcessOutput
+
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once its cancellation was requested."""
+
+
+class Job:
+    def __init__(self, job_id: str, owner: str, fn: Callable, kwargs: dict, log_lines: int = 2000):
+        self.id = job_id
+        self.owner = owner
+        self.fn = fn
+        self.kwargs = kwargs
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.log = deque(maxlen=log_lines)
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.stream = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def attach_stream(self, stream) -> None:
+        """Live output of the running job (e.g. a RunStream) for the UI to poll."""
+        self.stream = stream
+
+    def check_cancelled(self, *_args) -> None:
+        """Step callback: aborts the job between agent steps once cancelled."""
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.id)
+
+
+class _JobLog(StreamlitProcessOutput):
+    """Collects cleaned output lines into a job's log instead of a container."""
+
+    def __init__(self, job: Job):
+        super().__init__(container=None)
+        self.job = job
+        self.partial = ""
+
+    def write(self, text):
+        # print() writes a line in several chunks, so only complete lines are logged.
+        *lines, self.partial = (self.partial + text).split('\n')
+        for line in lines:
+            cleaned_text = self.clean_text(line)
+            if cleaned_text is not None and cleaned_text.strip():
+                self.job.log.append(cleaned_text.strip())
+
+
+class _ThreadRoutedStdout:
+    """
+    Replacement for sys.stdout that sends writes from worker threads to the
+    log of the job running on that thread, and everything else to the
+    original stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        sink = getattr(self.local, 'sink', None)
+        return (sink or self.stream).write(text)
+
+    def flush(self):
+        sink = getattr(self.local, 'sink', None)
+        (sink or self.stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class JobQueue:
+    """
+    In-process FIFO job queue served by a bounded thread pool.
+
+    Jobs are identified by id so a client can reattach to them after losing
+    its session, and by owner so each user only sees their own jobs. Queued
+    jobs can be cancelled right away; running jobs are cancelled
+    cooperatively through ``Job.check_cancelled``.
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished: int = 200):
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-crew')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        if not isinstance(sys.stdout, _ThreadRoutedStdout):
+            sys.stdout = _ThreadRoutedStdout(sys.stdout)
+        self._stdout = sys.stdout
+
+    def submit(self, owner: str, fn: Callable, job_id: Optional[str] = None, **kwargs) -> Job:
+        """Queue ``fn(job=<Job>, **kwargs)`` for execution."""
+        job = Job(job_id or uuid.uuid4().hex, owner, fn, kwargs)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs_for(self, owner: str) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if job.owner == owner]
+
+    def position(self, job_id: str) -> int:
+        """1-based position among queued jobs, or 0 when the job is not waiting."""
+        with self._lock:
+            queued = [job.id for job in self._jobs.values() if job.status == QUEUED]
+        return queued.index(job_id) + 1 if job_id in queued else 0
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        if job.future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def _execute(self, job: Job) -> None:
+        if job.cancel_event.is_set():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        self._stdout.local.sink = _JobLog(job)
+        try:
+            job.result = job.fn(job=job, **job.kwargs)
+            job.status = DONE
+        except Exception as e:
+            if job.cancel_event.is_set():
+                # The crew may wrap JobCancelled in its own exception type.
+                job.status = CANCELLED
+                return
+            job.status = FAILED
+            job.error = f"{e}\n{traceback.format_exc()}"
+        finally:
+            self._stdout.local.sink = None
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda job: job.finished_at)
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
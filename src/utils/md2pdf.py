@@ -1,3 +1,4 @@
+import os
 
 st_md="""
 ```markdown
@@ -83,10 +84,6 @@ Stay tuned for more updates and detailed analyses in our next edition. Thank you
 """
 
 
-#pip install git+https://github.com/PyFPDF/fpdf2.git@master
-from fpdf import FPDF
-import markdown
-
 def st_md2pdf(md_input_file, file_name="test-news.pdf"):
     content = ""
     try:
@@ -97,14 +94,10 @@ def st_md2pdf(md_input_file, file_name="test-news.pdf"):
     except Exception as e:
         print(f"An error occurred: {e}")
 
-    html_text = markdown.markdown(content)
-
-    pdf = FPDF()
-    pdf.core_fonts_encoding = 'utf-8'
-    pdf.add_page()
-   
-    pdf.write_html(html_text)
-    pdf.output(file_name)
+    from resume_crew.pdf_export import PdfRenderer
+    renderer = PdfRenderer()
+    renderer.add_markdown(os.path.basename(md_input_file), content)
+    renderer.output(file_name)
 
 if __name__ == "__main__":
     st_md2pdf(st_md)
@@ -3,28 +3,61 @@ import sys
 from contextlib import contextmanager
 from io import StringIO
 import re
+import time
+from collections import deque
 
 #--------------------------------#
 #         Output Handler         #
 #--------------------------------#
+# Compiled once: write() is called for every chunk the agents print.
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+FORMAT_CODES = re.compile(r'\[(?:1|95|92|00)m')
+
+
 class StreamlitProcessOutput:
-    def __init__(self, container):
+    """
+    File-like sink that shows captured output in a Streamlit container.
+
+    Only the last ``max_lines`` lines are kept and rendered, duplicates are
+    suppressed within a window of the last ``dedup_window`` distinct lines,
+    and the container is re-rendered at most once every ``min_interval``
+    seconds, so the cost of a write does not grow with the length of the run.
+    """
+
+    def __init__(self, container, max_lines=1000, dedup_window=5000, min_interval=0.25):
         self.container = container
-        self.output_text = ""
+        self.lines = deque(maxlen=max_lines)
         self.seen_lines = set()
-        
+        self.seen_order = deque()
+        self.dedup_window = dedup_window
+        self.min_interval = min_interval
+        self.last_render = 0.0
+        self.dirty = False
+
+    @property
+    def output_text(self):
+        return '\n'.join(self.lines)
+
     def clean_text(self, text):
         # Remove ANSI escape codes
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        text = ansi_escape.sub('', text)
+        text = ANSI_ESCAPE.sub('', text)
         
         # Remove LiteLLM debug messages
-        if text.strip().startswith('LiteLLM.Info:') or text.strip().startswith('Provider List:'):
+        stripped = text.strip()
+        if stripped.startswith('LiteLLM.Info:') or stripped.startswith('Provider List:'):
             return None
             
         # Clean up the formatting
-        text = text.replace('[1m', '').replace('[95m', '').replace('[92m', '').replace('[00m', '')
-        return text
+        return FORMAT_CODES.sub('', text)
+
+    def is_duplicate(self, line):
+        if line in self.seen_lines:
+            return True
+        self.seen_lines.add(line)
+        self.seen_order.append(line)
+        if len(self.seen_order) > self.dedup_window:
+            self.seen_lines.discard(self.seen_order.popleft())
+        return False
         
     def write(self, text):
         cleaned_text = self.clean_text(text)
@@ -32,25 +65,25 @@ class StreamlitProcessOutput:
             return
             
         # Split into lines and process each line
-        lines = cleaned_text.split('\n')
-        new_lines = []
-        
-        for line in lines:
+        for line in cleaned_text.split('\n'):
             line = line.strip()
-            if line and line not in self.seen_lines:
-                self.seen_lines.add(line)
-                new_lines.append(line)
+            if line and not self.is_duplicate(line):
+                self.lines.append(line)
+                self.dirty = True
         
-        if new_lines:
-            # Add the new lines to the output
-            new_content = '\n'.join(new_lines)
-            self.output_text = f"{self.output_text}\n{new_content}" if self.output_text else new_content
-            
-            # Update the display
+        self.flush()
+
+    def render(self):
+        if self.container is not None:
             self.container.text(self.output_text)
-        
+        self.last_render = time.monotonic()
+        self.dirty = False
+
     def flush(self):
-        pass
+        # rich flushes after every print, so flushing is throttled like
+        # writing; capture_output renders whatever is left at the end.
+        if self.dirty and time.monotonic() - self.last_render >= self.min_interval:
+            self.render()
 
 @contextmanager
 def capture_output(container):
@@ -63,6 +96,8 @@ def capture_output(container):
         yield string_io
     finally:
         sys.stdout = old_stdout
+        if output_handler.dirty:
+            output_handler.render()
 
 # Export the capture_output function
 __all__ = ['capture_output']
\ No newline at end of file